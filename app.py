@@ -1,24 +1,51 @@
 import datetime
+import time
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 import streamlit as st
-import plotly.express as px
 
-from db.database import init_db
+from db.database import ASYNC_WRITES, bind_database, current_database, init_db, use_tenant
 from constants import CATEGORIES, PAYMENT_METHODS
-from services.analytics_service import AnalyticsService
+from profiling import PROFILER, current_session
 from services.budget_service import BudgetService
+from services.downsample_service import MAX_LINE_POINTS, DownsampleService
 from services.expense_service import ExpenseService
+from services.export_service import EXPORT_FORMATS, ExportService
+from services.forecast_service import ANOMALY_Z, ForecastService
+from services.import_service import DATE_FORMATS, ImportService
+from services.recurring_service import RECURRING_INTERVAL, RECURRING_SCHEDULER, SCHEDULES, RecurringService
+from services.resample_service import GRANULARITIES, ResampleService
 
 PLOTS_DIR = Path(__file__).resolve().parent / "plots"
 DATA_DIR = Path(__file__).resolve().parent / "data"
 
 
-def init_app_state() -> None:
+def select_ledger() -> Optional[str]:
+    """Route this rerun to the session's ledger; a blank name uses the shared demo database."""
+    if "ledger" not in st.session_state:
+        st.session_state["ledger"] = st.query_params.get("ledger", "")
+    ledger = st.sidebar.text_input("Ledger", key="ledger", help="Each ledger name gets its own database.").strip()
+    try:
+        use_tenant(ledger or None)
+    except ValueError:
+        st.sidebar.error("Ledger names may contain letters, digits, '-' and '_' (max 64).")
+        ledger = ""
+        use_tenant(None)
+    return ledger or None
+
+
+def init_app_state(ledger: Optional[str] = None) -> None:
     init_db()
-    ExpenseService.seed_sample_data()
+    if ledger is None:
+        ExpenseService.seed_sample_data()
+    # Catch-up run: posts recurring expenses that fell due since the ledger was last open.
+    RecurringService.post_due()
+    # Ledgers migrated stale, or stale from a queued back-dated insert, are rebuilt here, never on a read.
+    ForecastService.rebuild()
+    if RECURRING_INTERVAL > 0:
+        RECURRING_SCHEDULER.watch(current_database())
     PLOTS_DIR.mkdir(exist_ok=True, parents=True)
     DATA_DIR.mkdir(exist_ok=True, parents=True)
 
@@ -39,10 +66,18 @@ def inject_css() -> None:
     )
 
 
+@PROFILER.timed("page")
 def add_expense_ui():
     st.header("Add Expense")
-    last_df = ExpenseService.list_expenses().sort_values("date")
-    last_expense = last_df.iloc[-1] if not last_df.empty else None
+    # With async writes, a queued save can fail after the rerun that submitted it has finished.
+    pending = st.session_state.get("pending_saves", [])
+    for future in pending:
+        if future.done() and future.exception() is not None:
+            st.error(f"An earlier expense could not be saved: {future.exception()}")
+    st.session_state["pending_saves"] = [future for future in pending if not future.done()]
+
+    last_df = ExpenseService.cached_expenses(limit=1, with_notes=False)
+    last_expense = last_df.iloc[0] if not last_df.empty else None
 
     if last_expense is not None:
         st.caption(
@@ -89,62 +124,62 @@ def add_expense_ui():
         if amount <= 0:
             st.warning("Amount must be greater than zero.")
             return
-        ExpenseService.add_expense(
-            {
-                "date": str(date),
-                "amount": amount,
-                "category": category,
-                "payment_method": payment_method,
-                "notes": notes,
-            }
-        )
+        expense = {
+            "date": str(date),
+            "amount": amount,
+            "category": category,
+            "payment_method": payment_method,
+            "notes": notes,
+        }
+        # Scored against the category's history before this expense joins it.
+        z_score = ForecastService.score(category, amount)
+        if ASYNC_WRITES:
+            st.session_state["pending_saves"].append(ExpenseService.submit_expense(expense))
+        else:
+            ExpenseService.add_expense(expense)
         st.success("Expense saved.")
+        if z_score is not None and z_score >= ANOMALY_Z:
+            st.warning(f"₹{amount:,.0f} is unusually high for {category} ({z_score:.1f}σ above its recent average).")
         if save_add:
             st.rerun()
 
 
+@PROFILER.timed("page")
 def manage_expenses_ui():
     st.header("Manage Expenses")
-    df = ExpenseService.list_expenses()
-    if df.empty:
+    bounds = ExpenseService.date_bounds()
+    if bounds is None:
         st.info("No expenses yet.")
         return
-    df["date"] = pd.to_datetime(df["date"])
-    min_date, max_date = df["date"].min().date(), df["date"].max().date()
+    min_date, max_date = bounds
 
     with st.expander("Filters", expanded=True):
         colf1, colf2 = st.columns(2)
         with colf1:
             start_date, end_date = st.date_input("Date range", value=(min_date, max_date))
         with colf2:
-            search_text = st.text_input("Search notes or payee", placeholder="Type to filter")
+            search_text = st.text_input(
+                "Search notes or payee",
+                placeholder="Type to filter",
+                help="Matches notes containing every word, including word prefixes (e.g. 'groc sup').",
+            )
 
         colf3, colf4 = st.columns(2)
-        categories = sorted(df["category"].unique().tolist())
+        categories = sorted(ExpenseService.cached_aggregate(group_by=["category"])["category"].tolist())
         selected_categories = st.multiselect("Categories", categories, default=categories)
         with colf4:
-            methods = sorted(df["payment_method"].unique().tolist())
+            methods = sorted(ExpenseService.cached_aggregate(group_by=["payment_method"])["payment_method"].tolist())
             selected_methods = st.multiselect("Payment methods", methods, default=methods)
 
-        sort_choice = st.selectbox(
-            "Sort by",
-            ["Date (newest)", "Date (oldest)", "Amount (high to low)", "Amount (low to high)"],
-            index=0,
-        )
-
-    filtered = df.copy()
-    if start_date and end_date:
-        filtered = filtered[(filtered["date"] >= pd.to_datetime(start_date)) & (filtered["date"] <= pd.to_datetime(end_date))]
-    if selected_categories:
-        filtered = filtered[filtered["category"].isin(selected_categories)]
-    if selected_methods:
-        filtered = filtered[filtered["payment_method"].isin(selected_methods)]
-    if search_text:
-        filtered = filtered[filtered["notes"].fillna("").str.contains(search_text, case=False, na=False)]
-
-    if filtered.empty:
-        st.info("No expenses match these filters.")
-        return
+        cols_sort = st.columns(2)
+        with cols_sort[0]:
+            sort_choice = st.selectbox(
+                "Sort by",
+                ["Date (newest)", "Date (oldest)", "Amount (high to low)", "Amount (low to high)"],
+                index=0,
+            )
+        with cols_sort[1]:
+            page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
 
     sort_map = {
         "Date (newest)": ("date", False),
@@ -153,11 +188,38 @@ def manage_expenses_ui():
         "Amount (low to high)": ("amount", True),
     }
     sort_col, ascending = sort_map[sort_choice]
-    filtered = filtered.sort_values(sort_col, ascending=ascending)
+    filters = {
+        "start": start_date or None,
+        "end": end_date or None,
+        "categories": selected_categories or None,
+        "methods": selected_methods or None,
+        "search": search_text or None,
+    }
+
+    # Keyset pagination: a stack of page-start cursors, reset whenever filters or sort change.
+    filter_sig = repr((sorted(filters.items()), sort_choice, page_size))
+    if st.session_state.get("manage_filter_sig") != filter_sig:
+        st.session_state["manage_filter_sig"] = filter_sig
+        st.session_state["manage_cursors"] = [None]
+    cursors = st.session_state["manage_cursors"]
+    selected = st.session_state.setdefault("manage_selected_ids", set())
+    # Part of the editor key: the keyed editor replays its checkbox edits on every rerun, so
+    # clearing the selection needs a fresh editor.
+    selection_round = st.session_state.setdefault("manage_selection_round", 0)
+
+    page_df, next_cursor = ExpenseService.page_expenses(
+        **filters, sort_by=sort_col, descending=not ascending, after=cursors[-1], page_size=page_size
+    )
+    if page_df.empty:
+        st.info("No expenses match these filters.")
+        if len(cursors) > 1:
+            st.session_state["manage_cursors"] = [None]
+        return
+    total = ExpenseService.count_expenses(**filters)
 
     view_cols = ["id", "date", "category", "payment_method", "amount", "notes"]
-    view_df = filtered[view_cols].copy()
-    view_df["Select"] = False
+    view_df = page_df[view_cols].copy()
+    view_df["Select"] = view_df["id"].isin(selected)
     view_df = view_df[["Select"] + view_cols]
 
     edited_df = st.data_editor(
@@ -174,10 +236,33 @@ def manage_expenses_ui():
             "amount": st.column_config.NumberColumn("Amount", format="₹%.0f"),
             "notes": st.column_config.Column("Notes"),
         },
+        key=f"manage_page_{filter_sig}_{len(cursors)}_{cursors[-1]}_{selection_round}",
     )
 
-    selected_rows = edited_df[edited_df["Select"]]
-    selected_ids = selected_rows["id"].astype(int).tolist()
+    # Selections persist by id across pages.
+    for eid, checked in zip(edited_df["id"].astype(int), edited_df["Select"]):
+        if checked:
+            selected.add(eid)
+        else:
+            selected.discard(eid)
+    selected_ids = sorted(selected)
+
+    pc1, pc2, pc3, pc4 = st.columns([1, 1, 3, 1])
+    with pc1:
+        if st.button("◀ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with pc2:
+        if st.button("Next ▶", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    with pc3:
+        st.caption(f"Page {len(cursors)} • {len(page_df)} of {total} matching expense(s) • {len(selected_ids)} selected")
+    with pc4:
+        if st.button("Clear selection", disabled=not selected_ids):
+            selected.clear()
+            st.session_state["manage_selection_round"] += 1
+            st.rerun()
 
     act_col1, act_col2 = st.columns(2)
     with act_col1:
@@ -185,8 +270,10 @@ def manage_expenses_ui():
             if not selected_ids:
                 st.warning("Pick at least one row to delete.")
             else:
-                for eid in selected_ids:
-                    ExpenseService.delete_expense(eid)
+                ExpenseService.delete_expenses(selected_ids)
+                selected.clear()
+                st.session_state["manage_selection_round"] += 1
+                st.session_state["manage_cursors"] = [None]
                 st.success(f"Deleted {len(selected_ids)} expense(s).")
                 st.rerun()
 
@@ -196,14 +283,20 @@ def manage_expenses_ui():
                 st.warning("Select at least one row to edit.")
             else:
                 st.session_state["editing_ids"] = selected_ids
+                st.session_state.pop("editing_original", None)
                 st.rerun()
 
     if "editing_ids" in st.session_state:
         ids_to_edit = st.session_state["editing_ids"]
-        to_edit = df[df["id"].isin(ids_to_edit)].copy()
-        
+        # Read once per edit session: saves are diffed against, and versioned by, what the user saw.
+        if "editing_original" not in st.session_state:
+            st.session_state["editing_original"] = ExpenseService.list_expenses(ids=ids_to_edit, with_version=True)
+            st.session_state["editing_round"] = st.session_state.get("editing_round", 0) + 1
+        to_edit = st.session_state["editing_original"]
+
         if to_edit.empty:
             del st.session_state["editing_ids"]
+            del st.session_state["editing_original"]
             st.rerun()
 
         st.subheader(f"Editing {len(to_edit)} Expense(s)")
@@ -223,93 +316,116 @@ def manage_expenses_ui():
                     "Payment", options=PAYMENT_METHODS, required=True
                 ),
                 "notes": st.column_config.TextColumn("Notes"),
+                "version": None,
             },
-            key="editor_multi",
+            key=f"editor_multi_{st.session_state['editing_round']}",
         )
 
         ec1, ec2 = st.columns(2)
         with ec1:
             if st.button("Save Changes", type="primary"):
-                for idx, row in edited_data.iterrows():
-                    d_val = row["date"]
-                    if hasattr(d_val, "date"):
-                        d_str = str(d_val.date())
+                edits = ExpenseService.diff_edits(to_edit, edited_data)
+                if not edits:
+                    st.info("No changes to save.")
+                else:
+                    saved, conflicts = ExpenseService.save_edits(edits)
+                    if conflicts:
+                        # Reload so the editor shows the other session's values and current versions.
+                        del st.session_state["editing_original"]
+                        st.session_state["edit_conflicts"] = (saved, conflicts)
                     else:
-                        d_str = str(d_val).split(" ")[0]
-
-                    ExpenseService.update_expense(
-                        int(row["id"]),
-                        {
-                            "date": d_str,
-                            "amount": float(row["amount"]),
-                            "category": row["category"],
-                            "payment_method": row["payment_method"],
-                            "notes": row["notes"],
-                        },
-                    )
-                st.success(f"Updated {len(edited_data)} expenses.")
-                del st.session_state["editing_ids"]
-                st.rerun()
-        
+                        st.session_state["edit_saved"] = len(saved)
+                        del st.session_state["editing_ids"]
+                        del st.session_state["editing_original"]
+                    st.rerun()
+
         with ec2:
             if st.button("Cancel"):
                 del st.session_state["editing_ids"]
+                del st.session_state["editing_original"]
                 st.rerun()
 
+        if conflict := st.session_state.pop("edit_conflicts", None):
+            saved, conflicts = conflict
+            st.warning(
+                f"Saved {len(saved)} expense(s). {len(conflicts)} were changed in another session since you "
+                f"opened them and were not saved (IDs {', '.join(map(str, conflicts))}); they now show the "
+                "latest values. Re-apply your edits and save again."
+            )
+
+    if updated := st.session_state.pop("edit_saved", None):
+        st.success(f"Updated {updated} expense(s).")
 
+
+@PROFILER.timed("page")
 def analytics_ui():
+    # Imported here so pages without charts never load Matplotlib/Plotly.
+    from services.analytics_service import AnalyticsService
+
     st.header("Analytics")
-    df = ExpenseService.list_expenses()
-    if df.empty:
+    bounds = ExpenseService.date_bounds()
+    if bounds is None:
         st.info("Add expenses to view analytics.")
         return
-    df["date"] = pd.to_datetime(df["date"])
-    min_date, max_date = df["date"].min(), df["date"].max()
-    start, end = st.date_input("Date Range", value=(min_date.date(), max_date.date()))
-    filtered = df[(df["date"] >= pd.to_datetime(start)) & (df["date"] <= pd.to_datetime(end))]
+    start, end = st.date_input("Date Range", value=bounds)
+    # Daily totals per category are all the chart builders need.
+    filtered = ExpenseService.cached_buckets(start, end, by=["category"])["Daily"]
     if filtered.empty:
         st.warning("No data in selected range.")
         return
 
+    # The three charts are independent, so they are built concurrently on the chart pool.
+    wall_start = time.perf_counter()
+    charts, timings = AnalyticsService.build_charts(filtered)
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+
     col1, col2 = st.columns(2)
     with col1:
-        fig_cat, breakdown = AnalyticsService.category_distribution(filtered)
-        st.pyplot(fig_cat)
-        st.download_button(
-            "Download Category Chart",
-            data=(PLOTS_DIR / "category_distribution.png").read_bytes(),
-            file_name="category_distribution.png",
-        )
+        png_cat, breakdown = charts["category_distribution"]
+        st.image(png_cat, use_container_width=True)
     with col2:
-        fig_daily, plotly_daily = AnalyticsService.daily_trend(filtered)
+        png_daily, plotly_daily = charts["daily_trend"]
         if plotly_daily is not None:
             st.plotly_chart(plotly_daily, use_container_width=True)
         else:
-            st.pyplot(fig_daily)
+            st.image(AnalyticsService.daily_trend(filtered, static=True)[0])
 
-    fig_monthly, plotly_monthly = AnalyticsService.monthly_comparison(filtered)
+    png_monthly, plotly_monthly = charts["monthly_comparison"]
     if plotly_monthly is not None:
         st.plotly_chart(plotly_monthly, use_container_width=True)
     else:
-        st.pyplot(fig_monthly)
+        st.image(AnalyticsService.monthly_comparison(filtered, static=True)[0])
+    st.caption(
+        f"Charts built in {wall_ms:,.0f} ms: "
+        + " · ".join(f"{name.replace('_', ' ')} {ms:,.0f} ms" for name, ms in timings.items())
+    )
 
     st.subheader("Summary Table")
-    summary = filtered.groupby("category")["amount"].agg(["sum", "mean", "count"]).reset_index()
+    summary = ExpenseService.cached_aggregate(start, end, group_by=["category"])
     st.dataframe(summary)
 
-    saved_plots = sorted(PLOTS_DIR.glob("*.png"))
-    if saved_plots:
-        st.subheader("Saved Plots")
-        cols = st.columns(2)
-        for idx, plot_path in enumerate(saved_plots):
-            with cols[idx % 2]:
-                if plot_path.exists():
-                    st.image(str(plot_path), caption=plot_path.name, use_container_width=True)
-    else:
-        st.caption("No saved plots yet.")
+    st.subheader("Static Exports")
+    st.caption(f"Report-quality PNGs are rendered on download and also saved to `{PLOTS_DIR.name}/`.")
+    cols = st.columns(3)
+    for col, (name, label) in zip(
+        cols,
+        [
+            ("category_distribution", "Category Chart"),
+            ("daily_trend", "Daily Trend"),
+            ("monthly_comparison", "Monthly Comparison"),
+        ],
+    ):
+        with col:
+            st.download_button(
+                f"Download {label}",
+                data=bind_database(lambda name=name: AnalyticsService.export_png(name, filtered)),
+                file_name=f"{name}.png",
+                mime="image/png",
+            )
 
 
 
+@PROFILER.timed("page")
 def budget_ui():
     st.header("Budgets & Goals")
     today = datetime.date.today()
@@ -318,12 +434,10 @@ def budget_ui():
     budget_row = BudgetService.get_budget(month)
     existing_budget = budget_row.get("budget", 0.0) if budget_row else 0.0
     existing_goal = budget_row.get("savings_goal", 0.0) if budget_row else 0.0
-    df = ExpenseService.list_expenses()
-    df["date"] = pd.to_datetime(df["date"]) if not df.empty else pd.to_datetime([])
-    current_period = pd.to_datetime(f"{month}-01").to_period("M") if month else today.to_period("M")
-    month_spent = df[df["date"].dt.to_period("M") == current_period]["amount"].sum() if not df.empty else 0.0
+    month_spent = BudgetService.month_spent(month) if month else 0.0
+    forecast_budget = ForecastService.suggest_budget(month) if month else None
 
-    suggested_budget = max(existing_budget, month_spent * 1.2 if month_spent else 5000)
+    suggested_budget = max(existing_budget, forecast_budget or (month_spent * 1.2 if month_spent else 5000))
     budget_ceiling = max(suggested_budget * 1.5, 5000)
     suggested_goal = max(existing_goal, budget_ceiling * 0.1)
 
@@ -373,6 +487,8 @@ def budget_ui():
         )
         budget = st.session_state["budget_input"]
         st.caption(f"Spent this month: ₹{month_spent:.0f}")
+        if forecast_budget:
+            st.caption(f"Forecast suggests ₹{forecast_budget:,.0f} (projected spend plus one standard deviation).")
     with bc2:
         st.slider(
             "Savings Goal",
@@ -397,7 +513,7 @@ def budget_ui():
         BudgetService.set_budget(month, budget, goal)
         st.success("Budget updated.")
 
-    progress = BudgetService.monthly_progress(df, month)
+    progress = BudgetService.monthly_progress(None, month)
     m1, m2, m3 = st.columns(3)
     m1.metric("Spent", f"₹{progress['spent']:.2f}")
     m2.metric("Budget", f"₹{progress['budget']:.2f}")
@@ -411,6 +527,79 @@ def budget_ui():
 
 
 
+@PROFILER.timed("page")
+def recurring_ui():
+    st.header("Recurring Expenses")
+    st.caption(
+        "Rent, utilities and subscriptions are posted automatically on each due date, including any "
+        "missed since the start date. Each occurrence is posted once, however often the schedule runs."
+    )
+    with st.form("recurring_form"):
+        c1, c2 = st.columns(2)
+        with c1:
+            name = st.text_input("Name", placeholder="e.g. Rent")
+            start = st.date_input("Start date", datetime.date.today())
+            schedule = st.selectbox("Repeats", SCHEDULES)
+        with c2:
+            amount = st.number_input("Amount", min_value=0.0, format="%.2f")
+            end = st.date_input("End date (optional)", value=None)
+            custom = st.text_input("Custom RRULE", placeholder="FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1", help="Used when Repeats is Custom.")
+        c3, c4 = st.columns(2)
+        category = c3.selectbox("Category", CATEGORIES)
+        payment_method = c4.selectbox("Payment Method", PAYMENT_METHODS)
+        notes = st.text_input("Notes", placeholder="Defaults to the name")
+        submitted = st.form_submit_button("Save Rule", type="primary")
+
+    if submitted:
+        if not name.strip() or amount <= 0:
+            st.warning("A name and an amount greater than zero are required.")
+        else:
+            try:
+                RecurringService.add_rule(
+                    {
+                        "name": name.strip(),
+                        "rrule": RecurringService.schedule_rule(schedule, start, custom),
+                        "start_date": str(start),
+                        "end_date": str(end) if end else None,
+                        "amount": amount,
+                        "category": category,
+                        "payment_method": payment_method,
+                        "notes": notes,
+                    }
+                )
+            except ValueError as exc:
+                st.error(str(exc))
+            else:
+                posted = RecurringService.post_due()
+                st.success(f"Rule saved; {posted:,} past occurrence(s) posted.")
+
+    rules = RecurringService.list_rules()
+    if rules.empty:
+        st.info("No recurring expenses yet.")
+        return
+    st.dataframe(
+        rules.drop(columns=["id"]).rename(columns={"rrule": "schedule"}),
+        use_container_width=True,
+        hide_index=True,
+    )
+    labels = dict(zip(rules["id"], rules["name"]))
+    rule_id = st.selectbox("Rule", list(labels), format_func=lambda rid: labels[rid])
+    rule = rules.set_index("id").loc[rule_id].where(lambda row: row.notna(), None)
+    if rule["next_due"]:
+        upcoming = RecurringService.occurrences(rule["rrule"], rule["start_date"], rule["end_date"], after=rule["next_due"])
+        st.caption(f"Upcoming: {', '.join(upcoming)}")
+    else:
+        st.caption("This schedule has finished.")
+    b1, b2 = st.columns(2)
+    if b1.button("Post due now"):
+        st.success(f"{RecurringService.post_due():,} expense(s) posted.")
+    if b2.button("Delete rule"):
+        RecurringService.delete_rule(int(rule_id))
+        st.success("Rule deleted; expenses it already posted are kept.")
+        st.rerun()
+
+
+@PROFILER.timed("page")
 def settings_ui():
     st.header("Settings")
     current_threshold = float(BudgetService.get_setting("alert_threshold", str(BudgetService.DEFAULT_ALERT_THRESHOLD)))
@@ -423,27 +612,144 @@ def settings_ui():
     st.caption("Spending alerts trigger when spending exceeds the configured threshold of your monthly budget.")
 
 
+def _run_summary(run: dict) -> dict:
+    spans = pd.DataFrame(run["spans"], columns=["kind", "name", "rows", "bytes_sent", "ms"])
+    by_kind = spans.groupby("kind")["ms"].sum()
+    return {
+        "started_at": run["started_at"],
+        "page": run["page"],
+        "total_ms": round(run["ms"], 1),
+        "queries": int((spans["kind"] == "query").sum()),
+        **{f"{kind}_ms": round(float(by_kind.get(kind, 0.0)), 1) for kind in ["query", "write", "frame", "pandas", "chart", "render"]},
+        "kb_sent": round(run["bytes_sent"] / 1024, 1),
+    }
+
+
+def diagnostics_ui():
+    st.header("Diagnostics")
+    # Kept outside the widget's own key, which Streamlit drops while another page is shown.
+    st.session_state["profile_reruns"] = st.toggle(
+        "Record this session's rerun timings", value=st.session_state.get("profile_reruns", True)
+    )
+    # Resolved here: the deferred download below runs on a thread with no session.
+    session = current_session()
+    runs = PROFILER.runs(session)
+    if not runs:
+        st.info("No reruns recorded yet. Visit a page, then come back here.")
+        return
+
+    st.subheader("Reruns")
+    st.caption("Wall time per rerun, split by span kind, and the size of the messages sent to the browser.")
+    summary = pd.DataFrame([_run_summary(run) for run in runs]).iloc[::-1]
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    st.subheader("Spans")
+    labels = [f"{row.started_at} · {row.page} · {row.total_ms:.0f} ms" for row in summary.itertuples()]
+    picked = st.selectbox("Rerun", range(len(labels)), format_func=labels.__getitem__)
+    spans = pd.DataFrame(runs[len(runs) - 1 - picked]["spans"])
+    if not spans.empty:
+        st.dataframe(spans.sort_values("ms", ascending=False), use_container_width=True, hide_index=True)
+
+    st.subheader("Slowest operations")
+    every_span = pd.DataFrame([span for run in runs for span in run["spans"]])
+    if not every_span.empty:
+        slowest = every_span.groupby(["kind", "name"])["ms"].agg(["count", "mean", "max", "sum"]).sort_values("sum", ascending=False)
+        st.dataframe(slowest.head(25).round(2), use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    c1.download_button(
+        "Download JSONL",
+        data=lambda: PROFILER.to_jsonl(session),
+        file_name="profile.jsonl",
+        mime="application/jsonl",
+    )
+    if c2.button("Clear recorded runs"):
+        PROFILER.clear(session)
+        st.rerun()
+
+
+@PROFILER.timed("page")
 def export_ui():
     st.header("Export")
-    df = ExpenseService.list_expenses()
-    if df.empty:
+    bounds = ExpenseService.date_bounds()
+    if bounds is None:
         st.info("Nothing to export.")
         return
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
-    st.download_button("Download CSV", data=csv_bytes, file_name="expenses.csv", mime="text/csv")
-    st.caption("Use the CSV in spreadsheets or BI tools for deeper analysis.")
+    c1, c2 = st.columns(2)
+    with c1:
+        start, end = st.date_input("Date range", value=bounds, key="export_range")
+    with c2:
+        categories = st.multiselect("Categories", CATEGORIES, default=CATEGORIES, key="export_categories")
+    fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+    matching = ExpenseService.count_expenses(start, end, categories or None)
+    st.caption(f"{matching:,} expense(s) match.")
+
+    # The file is streamed from SQLite in chunks only when the button is clicked.
+    spec = EXPORT_FORMATS[fmt]
+    st.download_button(
+        f"Download {fmt}",
+        data=bind_database(lambda: ExportService.export(fmt, start, end, categories or None)),
+        file_name=f"expenses.{spec['suffix']}",
+        mime=spec["mime"],
+        disabled=matching == 0,
+    )
+    st.caption("Use the CSV in spreadsheets or BI tools for deeper analysis; Parquet is smaller and keeps column types.")
 
 
+@PROFILER.timed("page")
+def import_ui():
+    st.header("Import")
+    st.caption(
+        "Upload a bank or card statement as CSV or Parquet with date, amount, category, payment_method and notes "
+        "columns. Rows already in your ledger are skipped, so re-importing the same file is safe."
+    )
+    uploaded = st.file_uploader("Statement file", type=["csv", "parquet"])
+    date_format = st.selectbox(
+        "Date format",
+        list(DATE_FORMATS),
+        help="Auto-detect reads every date in one format and asks when day and month could be swapped.",
+    )
+    if uploaded is None:
+        return
+    if not st.button("Import", type="primary"):
+        return
+
+    bar = st.progress(0.0, text="Starting import...")
+    try:
+        report = ImportService.import_file(
+            uploaded,
+            progress=lambda fraction, text: bar.progress(fraction, text=text),
+            date_format=DATE_FORMATS[date_format],
+        )
+    except ValueError as exc:
+        st.error(str(exc))
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Imported", f"{report['inserted']:,}")
+    c2.metric("Duplicates skipped", f"{report['duplicates']:,}")
+    c3.metric("Invalid rows", f"{report['invalid']:,}")
+    c4.metric("Rows / sec", f"{report['rows_per_sec']:,.0f}")
+    if report["errors"]:
+        st.warning("Some rows were rejected:")
+        st.table(pd.Series(report["errors"], name="rows").rename_axis("reason"))
+    st.success(f"Processed {report['read']:,} rows in {report['seconds']:.1f}s.")
+
+
+@PROFILER.timed("page")
 def dashboard_ui():
+    import plotly.express as px
+
     st.header("Dashboard")
-    df = ExpenseService.list_expenses()
-    if df.empty:
+    if ExpenseService.date_bounds() is None:
         st.info("Add expenses to view insights.")
         return
-    df["date"] = pd.to_datetime(df["date"])
-    current_month = datetime.date.today().strftime("%Y-%m")
-    monthly_df = df[df["date"].dt.to_period("M") == pd.to_datetime(current_month + "-01").to_period("M")]
-    total_spent = monthly_df["amount"].sum() if not monthly_df.empty else 0.0
+    today = datetime.date.today()
+    current_month = today.strftime("%Y-%m")
+    month_start = today.replace(day=1)
+    month_end = (pd.Timestamp(month_start) + pd.offsets.MonthEnd(0)).date()
+    cat_summary = ExpenseService.cached_aggregate(month_start, month_end, group_by=["category"])
+    total_spent = float(cat_summary["sum"].sum())
     budget_row = BudgetService.get_budget(current_month)
     budget = budget_row.get("budget", 0.0) if budget_row else 0.0
     savings_goal = budget_row.get("savings_goal", 0.0) if budget_row else 0.0
@@ -456,17 +762,25 @@ def dashboard_ui():
 
     if alert_msg := BudgetService.spending_alert(total_spent, budget):
         st.error(alert_msg)
+    forecast = ForecastService.month_forecast(current_month, today)
+    if alert_msg := BudgetService.projection_alert(forecast, budget):
+        st.warning(alert_msg)
 
     # Dashboard highlights
-    total_txns = len(monthly_df)
-    avg_daily = monthly_df.groupby(monthly_df["date"].dt.date)["amount"].sum().mean() if not monthly_df.empty else 0.0
-    top_cat_row = monthly_df.groupby("category")["amount"].sum().sort_values(ascending=False).reset_index().head(1)
-    top_cat = f"{top_cat_row.iloc[0]['category']} (₹{top_cat_row.iloc[0]['amount']:.0f})" if not top_cat_row.empty else "-"
+    total_txns = int(cat_summary["count"].sum())
+    avg_daily = ExpenseService.cached_aggregate(month_start, month_end, group_by=["date"])["sum"].mean() if total_txns else 0.0
+    top_cat_row = cat_summary.sort_values("sum", ascending=False).head(1)
+    top_cat = f"{top_cat_row.iloc[0]['category']} (₹{top_cat_row.iloc[0]['sum']:.0f})" if not top_cat_row.empty else "-"
 
-    highlights_col1, highlights_col2, highlights_col3 = st.columns(3)
+    highlights_col1, highlights_col2, highlights_col3, highlights_col4 = st.columns(4)
     highlights_col1.metric("Transactions", total_txns)
     highlights_col2.metric("Avg Daily Spend", f"₹{avg_daily:.0f}")
     highlights_col3.metric("Top Category", top_cat)
+    highlights_col4.metric(
+        "Projected Month-end",
+        f"₹{forecast['projected']:,.0f}",
+        help=f"90% range ₹{forecast['low']:,.0f} – ₹{forecast['high']:,.0f}, from EWMA spend per category and day of month.",
+    )
 
     if budget > 0:
         usage = min(total_spent / budget, 1.0)
@@ -476,12 +790,17 @@ def dashboard_ui():
 
     with overview_tab:
         st.subheader("Recent Expenses")
-        st.dataframe(monthly_df.sort_values("date", ascending=False).head(10))
+        st.dataframe(ExpenseService.cached_expenses(month_start, month_end, limit=10))
 
         st.subheader("Category Summary")
-        cat_summary = monthly_df.groupby("category")["amount"].agg(["sum", "mean", "count"]).reset_index()
         st.dataframe(cat_summary)
 
+        unusual = ForecastService.anomalies(ExpenseService.cached_expenses(month_start, month_end))
+        if not unusual.empty:
+            st.subheader("Unusual Expenses")
+            st.caption(f"Amounts at least {ANOMALY_Z:.0f}σ above their category's recent average.")
+            st.dataframe(unusual.head(10))
+
     with charts_tab:
         # Dashboard charts can be widened beyond current month to avoid empty categories.
         chart_range = st.selectbox(
@@ -493,45 +812,48 @@ def dashboard_ui():
         with col_opts1:
             breakdown = st.selectbox("Breakdown", ["Category", "Payment Method"], index=0)
         with col_opts2:
-            agg_period = st.selectbox("Trend granularity", ["Daily", "Weekly", "Monthly"], index=0)
+            agg_period = st.selectbox("Trend granularity", ["Auto", "Daily", "Weekly", "Monthly"], index=0)
 
         if chart_range == "Current Month":
-            chart_df = monthly_df
-            range_label = "Current Month"
+            chart_start, chart_end = month_start, month_end
         elif chart_range == "Last 30 Days":
-            start = pd.to_datetime(datetime.date.today() - datetime.timedelta(days=30))
-            chart_df = df[df["date"] >= start]
-            range_label = "Last 30 Days"
+            chart_start, chart_end = today - datetime.timedelta(days=30), None
         elif chart_range == "Year-to-date":
-            start = pd.to_datetime(datetime.date(datetime.date.today().year, 1, 1))
-            chart_df = df[df["date"] >= start]
-            range_label = "Year-to-date"
+            chart_start, chart_end = datetime.date(today.year, 1, 1), None
         else:
-            chart_df = df
-            range_label = "All Time"
+            chart_start, chart_end = None, None
+        range_label = chart_range
 
-        if chart_df.empty:
-            st.info("No data for the selected range.")
+        if breakdown == "Category":
+            dim_col = "category"
+            dims = CATEGORIES
         else:
-            if breakdown == "Category":
-                dim_col = "category"
-                dims = CATEGORIES
-            else:
-                dim_col = "payment_method"
-                dims = PAYMENT_METHODS
+            dim_col = "payment_method"
+            dims = PAYMENT_METHODS
+        dim_totals = ExpenseService.cached_aggregate(chart_start, chart_end, group_by=[dim_col])
 
+        if dim_totals.empty:
+            st.info("No data for the selected range.")
+        else:
             cat_totals = (
-                chart_df.groupby(dim_col)["amount"].sum()
+                dim_totals.set_index(dim_col)["sum"].rename("amount")
                 .reindex(dims, fill_value=0)
+                .rename_axis(dim_col)
                 .reset_index()
             )
             donut = px.pie(cat_totals, names=dim_col, values="amount", hole=0.45, title=f"{breakdown} Mix ({range_label})")
 
-            freq_map = {"Daily": "D", "Weekly": "W-MON", "Monthly": "MS"}
-            daily_totals = (
-                chart_df.set_index("date")["amount"].resample(freq_map[agg_period]).sum().reset_index()
-            )
-            daily_line = px.line(daily_totals, x="date", y="amount", markers=True, title=f"Trend ({agg_period}, {range_label})")
+            trend_buckets = ExpenseService.cached_buckets(chart_start, chart_end, dense=True, freqs=GRANULARITIES)
+            if agg_period == "Auto":
+                # Finest granularity that fits the point budget: daily for a month, monthly or coarser for years.
+                trend_days = ResampleService.day_keys(trend_buckets["Daily"]["date"])
+                agg_period = ResampleService.auto_frequency(trend_days, MAX_LINE_POINTS)
+            trend = trend_buckets[agg_period]
+            shown = DownsampleService.downsample(trend, max_points=MAX_LINE_POINTS)
+            trend_title = f"Trend ({agg_period}, {range_label})"
+            if len(shown) < len(trend):
+                trend_title += f" – {len(shown):,} of {len(trend):,} points"
+            daily_line = px.line(shown, x="date", y="amount", markers=len(shown) <= 90, title=trend_title)
 
             bar_all = px.bar(cat_totals.sort_values("amount", ascending=False), x=dim_col, y="amount", title=f"{breakdown} Totals ({range_label})")
 
@@ -545,15 +867,34 @@ def dashboard_ui():
 
 
 
-NAVIGATION = ["Dashboard", "Add Expense", "Manage Expenses", "Analytics", "Budgets & Goals", "Settings", "Export"]
+NAVIGATION = [
+    "Dashboard",
+    "Add Expense",
+    "Manage Expenses",
+    "Analytics",
+    "Budgets & Goals",
+    "Recurring",
+    "Settings",
+    "Export",
+    "Import",
+    "Diagnostics",
+]
 
 
 def main():
+    # Each session turns its own profiling on or off on the Diagnostics page.
+    with PROFILER.run(enabled=st.session_state.get("profile_reruns", True)) as run:
+        render_app(run)
+
+
+def render_app(run: Optional[dict]) -> None:
     st.set_page_config(page_title="Expense Analytics", layout="wide")
     inject_css()
-    init_app_state()
     st.sidebar.title("Expense Analytics")
+    init_app_state(select_ledger())
     choice = st.sidebar.radio("Navigate", NAVIGATION, key="navigation_radio")
+    if run is not None:
+        run["page"] = choice
 
     if choice == "Dashboard":
         dashboard_ui()
@@ -565,10 +906,16 @@ def main():
         analytics_ui()
     elif choice == "Budgets & Goals":
         budget_ui()
+    elif choice == "Recurring":
+        recurring_ui()
     elif choice == "Settings":
         settings_ui()
     elif choice == "Export":
         export_ui()
+    elif choice == "Import":
+        import_ui()
+    elif choice == "Diagnostics":
+        diagnostics_ui()
 
 
 if __name__ == "__main__":
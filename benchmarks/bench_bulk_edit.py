@@ -0,0 +1,52 @@
+"""1k-row edit and delete: one commit per row vs one batched transaction vs a delta save.
+
+Run from the project root: python -m benchmarks.bench_bulk_edit
+"""
+import time
+
+from benchmarks.common import temp_database
+from db.database import execute_many
+from services.expense_service import ExpenseService
+
+ROWS = 1000
+
+
+def _seed() -> list:
+    execute_many(
+        "INSERT INTO expenses(date, amount, category, payment_method, notes) VALUES (?, ?, ?, ?, ?)",
+        [("2025-01-01", float(i), "Food", "Cash", f"row {i}") for i in range(ROWS)],
+    )
+    return [int(row["id"]) for row in ExpenseService.list_expenses().to_dict("records")]
+
+
+def _updates(ids: list) -> list:
+    return [
+        {"id": eid, "date": "2025-02-01", "amount": 42.0, "category": "Rent", "payment_method": "Card", "notes": "edited"}
+        for eid in ids
+    ]
+
+
+def _timed(label: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:>9.1f} ms  ({ROWS / elapsed:>9.0f} rows/s)")
+
+
+def main() -> None:
+    with temp_database():
+        ids = _seed()
+        updates = _updates(ids)
+        _timed("update: per-row update_expense", lambda: [ExpenseService.update_expense(u["id"], u) for u in updates])
+        _timed("update: batched update_expenses", lambda: ExpenseService.update_expenses(updates))
+        # The Manage editor path: diff the editor output, then write only the changed cells.
+        original = ExpenseService.list_expenses(with_version=True)
+        edited = original.assign(amount=original["amount"] + 1)
+        _timed("update: diff_edits + save_edits", lambda: ExpenseService.save_edits(ExpenseService.diff_edits(original, edited)))
+        _timed("delete: per-row delete_expense", lambda: [ExpenseService.delete_expense(eid) for eid in ids])
+        ids = _seed()
+        _timed("delete: batched delete_expenses", lambda: ExpenseService.delete_expenses(ids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Analytics charts: built one after another vs concurrently with AnalyticsService.build_charts.
+
+Run from the project root: python -m benchmarks.bench_charts [--rows 100000] [--static]
+Concurrency only pays off with more than one core; the worker count is EXPENSE_CHART_WORKERS.
+"""
+import argparse
+import os
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from services.analytics_service import CHART_WORKERS, PLOT_CACHE, AnalyticsService
+from services.expense_service import ExpenseService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--static", action="store_true", help="also render the trend PNGs at export DPI")
+    args = parser.parse_args()
+    dpi = 200 if args.static else 100
+
+    with temp_database():
+        ExpenseService.bulk_insert(ExpenseService.generate_expenses(args.rows, start_date="2020-01-01"))
+        # The frame the Analytics page passes to the chart builders.
+        frame = ExpenseService.buckets(by=["category"])["Daily"]
+
+        def serial() -> None:
+            PLOT_CACHE.clear()
+            AnalyticsService.category_distribution(frame, dpi=dpi)
+            AnalyticsService.daily_trend(frame, static=args.static, dpi=dpi)
+            AnalyticsService.monthly_comparison(frame, static=args.static, dpi=dpi)
+
+        def concurrent() -> dict:
+            PLOT_CACHE.clear()
+            return AnalyticsService.build_charts(frame, static=args.static, dpi=dpi)[1]
+
+        serial()
+        concurrent()
+        print(f"{args.rows:,} rows, {len(frame):,} chart rows, {CHART_WORKERS} workers, {os.cpu_count()} cpus (microseconds)")
+        print_row("one after another", summarize(time_calls(serial, args.repeat)))
+        print_row("build_charts", summarize(time_calls(concurrent, args.repeat)))
+        for name, ms in concurrent().items():
+            print(f"  {name:<30} {ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per-query latency: connect-per-call vs the pooled connection layer.
+
+Run from the project root: python -m benchmarks.bench_connection
+"""
+import sqlite3
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from db.database import execute, fetch_all
+
+REPEAT = 2000
+
+
+def main() -> None:
+    with temp_database() as path:
+        for i in range(200):
+            execute(
+                "INSERT INTO expenses(date, amount, category, payment_method, notes) VALUES (?, ?, ?, ?, ?)",
+                ("2025-01-01", float(i), "Food", "Cash", f"row {i}"),
+            )
+
+        def connect_per_call() -> None:
+            conn = sqlite3.connect(path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("SELECT value FROM settings WHERE key=?", ("alert_threshold",)).fetchall()
+            conn.close()
+
+        def pooled() -> None:
+            fetch_all("SELECT value FROM settings WHERE key=?", ("alert_threshold",))
+
+        def connect_per_call_write() -> None:
+            conn = sqlite3.connect(path)
+            conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES ('bench', '1')")
+            conn.commit()
+            conn.close()
+
+        def pooled_write() -> None:
+            execute("INSERT OR REPLACE INTO settings(key, value) VALUES ('bench', '1')")
+
+        print_row("read: connect-per-call", summarize(time_calls(connect_per_call, REPEAT)))
+        print_row("read: pooled", summarize(time_calls(pooled, REPEAT)))
+        print_row("write: connect-per-call", summarize(time_calls(connect_per_call_write, REPEAT // 4)))
+        print_row("write: pooled (WAL, NORMAL)", summarize(time_calls(pooled_write, REPEAT // 4)))
+
+
+if __name__ == "__main__":
+    main()
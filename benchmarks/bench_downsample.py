@@ -0,0 +1,53 @@
+"""Trend chart payload: every daily point vs the MAX_LINE_POINTS budget, plus decimation cost.
+
+Run from the project root: python -m benchmarks.bench_downsample [--rows 200000] [--years 10]
+"""
+import argparse
+
+import numpy as np
+import plotly.express as px
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from services.analytics_service import AnalyticsService
+from services.downsample_service import MAX_LINE_POINTS, DownsampleService
+from services.expense_service import ExpenseService
+from services.resample_service import GRANULARITIES, ResampleService
+
+
+def figure_kib(frame) -> float:
+    return len(px.line(frame, x="date", y="amount").to_json()) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start_year = 2025 - args.years
+    with temp_database():
+        ledger = ExpenseService.generate_expenses(args.rows, start_date=f"{start_year}-01-01")
+        ExpenseService.bulk_insert(ledger)
+        buckets = ExpenseService.buckets(dense=True, freqs=GRANULARITIES)
+        daily = buckets["Daily"]
+        auto = ResampleService.auto_frequency(ResampleService.day_keys(daily["date"]), MAX_LINE_POINTS)
+        print(f"{args.rows:,} rows over {args.years} years, point budget {MAX_LINE_POINTS}")
+        print(f"{'every day':<32} {len(daily):>7,} points {figure_kib(daily):>9.1f} KiB")
+        for method in ("lttb", "minmax"):
+            shown = DownsampleService.downsample(daily, max_points=MAX_LINE_POINTS, method=method)
+            print(f"{method:<32} {len(shown):>7,} points {figure_kib(shown):>9.1f} KiB")
+        print(f"{'auto granularity: ' + auto:<32} {len(buckets[auto]):>7,} points {figure_kib(buckets[auto]):>9.1f} KiB")
+        months = len(buckets["Monthly"])
+        bars = AnalyticsService._monthly_totals(buckets["Daily"])
+        print(f"monthly_comparison: {months} months -> {len(bars)} bars by {bars.columns[0]}")
+
+        y = np.random.default_rng(42).normal(size=1_000_000).cumsum()
+        x = np.arange(y.size, dtype=np.float64)
+        print("decimating 1,000,000 points (microseconds)")
+        print_row("lttb", summarize(time_calls(lambda: DownsampleService.lttb(x, y, MAX_LINE_POINTS), args.repeat)))
+        print_row("min_max", summarize(time_calls(lambda: DownsampleService.min_max(y, MAX_LINE_POINTS), args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Cost of the forecast statistics: insert triggers, rebuilding stale categories, and the reads.
+
+Run from the project root: python -m benchmarks.bench_forecast
+Consistency with a from-scratch rebuild is asserted in tests/test_forecast_service.py.
+"""
+import time
+from datetime import date
+
+from benchmarks.common import temp_database
+from db.database import execute
+from services.expense_service import ExpenseService
+from services.forecast_service import ForecastService
+
+
+def main() -> None:
+    ledger = ExpenseService.generate_expenses(100_000, start_date="2022-01-01").sort_values("date")
+    with temp_database():
+        execute("DROP TRIGGER trg_expenses_stats_insert")
+        start = time.perf_counter()
+        ExpenseService.bulk_insert(ledger)
+        print(f"bulk insert of {len(ledger):,} rows without stats triggers: {time.perf_counter() - start:.2f} s")
+
+    with temp_database():
+        start = time.perf_counter()
+        ExpenseService.bulk_insert(ledger)
+        print(f"bulk insert of {len(ledger):,} rows with stats triggers: {time.perf_counter() - start:.2f} s")
+
+        every = ExpenseService.list_expenses()["category"].astype(str).unique().tolist()
+        start = time.perf_counter()
+        ForecastService.rebuild(every)
+        print(f"rebuild of all {len(every)} categories: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        forecast = ForecastService.month_forecast(date.today().strftime("%Y-%m"))
+        forecast_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        ForecastService.score("Food", 2_500.0)
+        score_ms = (time.perf_counter() - start) * 1000
+        print(f"month_forecast: {forecast_ms:.2f} ms (projected {forecast['projected']:,.0f}); score: {score_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
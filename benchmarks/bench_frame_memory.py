@@ -0,0 +1,61 @@
+"""Expense frame footprint: sqlite3.Row objects into pandas vs the compact load_frame loader.
+
+Run from the project root: python -m benchmarks.bench_frame_memory [--rows 1000000]
+"""
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from db.database import fetch_all
+from services.expense_service import EXPENSE_COLUMNS, ExpenseService
+
+
+def row_frame() -> pd.DataFrame:
+    # The loader before load_frame: Row objects, object-dtype labels and notes, datetime dates.
+    rows = fetch_all(
+        "SELECT id, day_key, amount, category, payment_method, notes FROM expenses ORDER BY date DESC, id DESC"
+    )
+    df = pd.DataFrame(rows, columns=EXPENSE_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"], unit="D")
+    return df
+
+
+def footprint(loader) -> str:
+    tracemalloc.start()
+    df = loader()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return f"frame={df.memory_usage(deep=True).sum() / 2**20:>7.1f} MiB  load peak={peak / 2**20:>7.1f} MiB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ledger = ExpenseService.generate_expenses(args.rows, start_date="2015-01-01")
+    with temp_database():
+        ExpenseService.bulk_insert(ledger)
+        loaders = {
+            "Row objects": row_frame,
+            "load_frame(with_notes=True)": lambda: ExpenseService.load_frame(with_notes=True),
+            "load_frame()": ExpenseService.load_frame,
+        }
+        baseline = row_frame()
+        compact = ExpenseService.load_frame()
+        assert (baseline["id"].to_numpy() == compact["id"].to_numpy()).all()
+        assert (baseline["category"].to_numpy() == compact["category"].astype(object).to_numpy()).all()
+        assert (baseline["amount"].to_numpy() == compact["amount"].to_numpy()).all()
+
+        print(f"{args.rows:,} rows (frame: memory_usage(deep=True); peak: tracemalloc; times in microseconds)")
+        for label, loader in loaders.items():
+            print(f"{label:<32} {footprint(loader)}")
+        for label, loader in loaders.items():
+            print_row(label, summarize(time_calls(loader, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Bulk statement import throughput for CSV and Parquet files.
+
+Run from the project root: python -m benchmarks.bench_import [--rows 500000]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.common import temp_database
+from services.expense_service import ExpenseService
+from services.import_service import ImportService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    statement = ExpenseService.generate_expenses(args.rows, start_date="2015-01-01", seed=7)
+    statement = statement.astype({"category": str, "payment_method": str})
+    # A realistic statement has some junk and some repeated lines.
+    statement.loc[statement.index[::997], "category"] = "Unknown"
+    statement = pd.concat([statement, statement.iloc[: args.rows // 50]], ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {"csv": Path(tmp) / "statement.csv", "parquet": Path(tmp) / "statement.parquet"}
+        statement.to_csv(files["csv"], index=False)
+        statement.to_parquet(files["parquet"], index=False)
+        for fmt, path in files.items():
+            with temp_database():
+                first = ImportService.import_file(path)
+                again = ImportService.import_file(path)
+            print(
+                f"{fmt:<8} {first['read']:>9,} read  {first['inserted']:>9,} inserted  "
+                f"{first['duplicates']:>7,} dup  {first['invalid']:>6,} invalid  "
+                f"{first['rows_per_sec']:>9,.0f} rows/s  | re-import inserted {again['inserted']:,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
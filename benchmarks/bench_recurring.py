@@ -0,0 +1,58 @@
+"""Recurring backfill: one post_due transaction vs an add_expense per occurrence, plus the no-op check.
+
+Run from the project root: python -m benchmarks.bench_recurring [--years 10]
+"""
+import argparse
+import time
+from datetime import date
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from db.database import fetch_tuples
+from services.expense_service import ExpenseService
+from services.recurring_service import RecurringService
+
+RULES = [
+    ("Rent", "FREQ=MONTHLY;BYMONTHDAY=1", 25_000.0, "Rent"),
+    ("Coffee", "FREQ=DAILY", 150.0, "Food"),
+    ("Gym", "FREQ=WEEKLY;BYDAY=MO,TH", 400.0, "Health"),
+]
+
+
+def _add_rules(start: str) -> None:
+    for name, rule, amount, category in RULES:
+        RecurringService.add_rule(
+            {"name": name, "rrule": rule, "start_date": start, "amount": amount, "category": category, "payment_method": "UPI"}
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    today = date.today()
+    start = f"{today.year - args.years}-01-01"
+
+    with temp_database():
+        _add_rules(start)
+        elapsed = time.perf_counter()
+        posted = RecurringService.post_due(today)
+        elapsed = time.perf_counter() - elapsed
+        print(f"{'post_due backfill':<32} {posted:>7,} expenses {elapsed * 1000:>9.1f} ms")
+        replay = RecurringService.post_due(today)
+        print(f"{'post_due again':<32} {replay:>7,} expenses")
+        print_row("no-op check (microseconds)", summarize(time_calls(lambda: RecurringService.post_due(today), args.repeat)))
+        occurrences = fetch_tuples("SELECT date, amount, category, payment_method, notes FROM expenses ORDER BY date")
+
+    with temp_database():
+        elapsed = time.perf_counter()
+        for day, amount, category, method, notes in occurrences:
+            ExpenseService.add_expense(
+                {"date": day, "amount": amount, "category": category, "payment_method": method, "notes": notes}
+            )
+        elapsed = time.perf_counter() - elapsed
+        print(f"{'add_expense per occurrence':<32} {len(occurrences):>7,} expenses {elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Daily/Weekly/Monthly buckets by category and method: pandas resample vs the day-key engine.
+
+Run from the project root: python -m benchmarks.bench_resample [--rows 1000000] [--skip-sql]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import print_row, summarize, temp_database, time_calls
+from services.expense_service import ExpenseService
+from services.resample_service import FREQUENCIES, ResampleService
+
+PANDAS_RULES = {"Daily": "D", "Weekly": "W-MON", "Monthly": "MS"}
+BY = ["category", "payment_method"]
+
+
+def pandas_buckets(df: pd.DataFrame) -> dict:
+    out = {}
+    for freq, rule in PANDAS_RULES.items():
+        grouper = pd.Grouper(key="date", freq=rule, label="left", closed="left")
+        out[freq] = df.groupby([grouper, *BY], observed=True)["amount"].agg(["sum", "count"]).reset_index()
+        out[freq] = out[freq][out[freq]["count"] > 0].reset_index(drop=True)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-sql", action="store_true", help="skip the SQLite rollup path (loads the ledger)")
+    args = parser.parse_args()
+
+    ledger = ExpenseService.generate_expenses(args.rows, start_date="2015-01-01")
+    ledger["date"] = pd.to_datetime(ledger["date"])
+    frame = ledger.assign(day_key=ResampleService.day_keys(ledger["date"]).astype(np.int32))
+    print(f"{args.rows:,} rows, buckets {', '.join(FREQUENCIES)} by {' x '.join(BY)} (microseconds)")
+
+    expected = pandas_buckets(ledger)
+    actual = ResampleService.resample_all(frame, BY)
+    for freq in FREQUENCIES:
+        assert np.allclose(expected[freq]["sum"], actual[freq]["amount"]), freq
+        assert (expected[freq]["count"].to_numpy() == actual[freq]["count"].to_numpy()).all(), freq
+
+    print_row("pandas Grouper x3", summarize(time_calls(lambda: pandas_buckets(ledger), args.repeat)))
+    print_row("engine, raw rows", summarize(time_calls(lambda: ResampleService.resample_all(frame, BY), args.repeat)))
+
+    if not args.skip_sql:
+        with temp_database():
+            ExpenseService.bulk_insert(ledger.assign(date=ledger["date"].dt.strftime("%Y-%m-%d")))
+            rollup = ExpenseService.daily_totals()
+            print(f"daily rollup: {len(rollup):,} rows")
+            print_row("rollup read", summarize(time_calls(ExpenseService.daily_totals, args.repeat)))
+            print_row("engine, rollup rows", summarize(time_calls(lambda: ResampleService.resample_all(rollup, BY), args.repeat)))
+            print_row("ExpenseService.buckets", summarize(time_calls(lambda: ExpenseService.buckets(by=BY), args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Notes search: pandas str.contains scan vs SQL LIKE vs the FTS5 index.
+
+Run from the project root: python -m benchmarks.bench_search [--rows 1000000]
+"""
+import argparse
+import time
+
+from benchmarks.common import temp_database
+from db.database import fetch_all
+from services.expense_service import ExpenseService
+
+QUERIES = ["groceries", "rent #12", "util 9999"]
+
+
+def _ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    with temp_database():
+        ExpenseService.bulk_insert(ExpenseService.generate_expenses(args.rows))
+        print(f"{args.rows:,} rows")
+        for text in QUERIES:
+            # The old page loaded every row, then scanned notes with a case-insensitive regex per term.
+            load_ms = _ms(lambda: ExpenseService.list_expenses())
+            df = ExpenseService.list_expenses()
+            scan_ms = _ms(lambda: df[df["notes"].fillna("").str.contains(text, case=False, na=False)])
+            like_ms = _ms(lambda: fetch_all("SELECT id FROM expenses WHERE notes LIKE ?", (f"%{text}%",)))
+            hits = []
+            fts_ms = _ms(lambda: hits.extend(ExpenseService.search_expense_ids(text)))
+            print(
+                f"  {text!r:<14} load+scan {load_ms + scan_ms:8.1f} ms (scan {scan_ms:7.1f})"
+                f"  LIKE {like_ms:7.1f} ms  FTS5 {fts_ms:7.1f} ms  ({len(hits):,} matches)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cold-start import profile of the app module, from `python -X importtime`.
+
+Run from the project root: python -m benchmarks.bench_startup
+Each run spawns fresh interpreters so nothing is served from sys.modules.
+"""
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNS = 5
+HEAVY = ("matplotlib", "plotly.express", "pandas", "numpy", "streamlit")
+
+
+def import_profile(statement: str) -> Tuple[float, Dict[str, float]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0.0
+    modules: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        # Each module is reported once, on first import; nesting adds two spaces of indent.
+        modules[raw_name.strip()] = float(cumulative_us)
+        if len(raw_name) - len(raw_name.lstrip()) == 1:
+            total_us += float(cumulative_us)
+    return total_us / 1e6, modules
+
+
+def summarize(label: str, statement: str) -> None:
+    totals: List[float] = []
+    heavy: Dict[str, List[float]] = {name: [] for name in HEAVY}
+    for _ in range(RUNS):
+        total, modules = import_profile(statement)
+        totals.append(total)
+        for name in HEAVY:
+            heavy[name].append(modules.get(name, 0.0) / 1e3)
+    loaded = ", ".join(f"{name}={statistics.median(ms):.0f}ms" for name, ms in heavy.items() if statistics.median(ms))
+    print(f"{label:<28} median {statistics.median(totals) * 1000:7.0f} ms  [{loaded}]")
+
+
+def main() -> None:
+    summarize("import app", "import app")
+    summarize("import app + charts", "import app, services.analytics_service, matplotlib.pyplot, plotly.express")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Concurrent writers: one shared database vs per-tenant databases behind the pool LRU.
+
+Run from the project root: python -m benchmarks.bench_tenants [--sessions 64] [--writes 200]
+"""
+import argparse
+import threading
+import time
+from typing import List, Optional
+
+import db.database as database
+from benchmarks.common import print_row, summarize, temp_database
+from db.database import init_db, open_databases, tenant_database
+from services.expense_service import ExpenseService
+
+EXPENSE = {"date": "2026-01-15", "amount": 420.0, "category": "Food", "payment_method": "UPI", "notes": "lunch"}
+
+
+def run_sessions(sessions: int, writes: int, per_tenant: bool) -> None:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    peak_open = 0
+    barrier = threading.Barrier(sessions)
+
+    def session(index: int) -> None:
+        nonlocal peak_open
+        tenant: Optional[str] = f"user{index:04d}" if per_tenant else None
+        samples = []
+        with tenant_database(tenant):
+            init_db()
+            barrier.wait()
+            for _ in range(writes):
+                start = time.perf_counter()
+                ExpenseService.add_expense(EXPENSE)
+                samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+            peak_open = max(peak_open, open_databases())
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    label = "per-tenant databases" if per_tenant else "one shared database"
+    stats = summarize(latencies)
+    stats["max_us"] = max(latencies) * 1e6
+    print_row(label, stats)
+    print(f"{'':<32} {len(latencies) / elapsed:,.0f} writes/s, peak open databases {peak_open}")
+
+    if per_tenant:
+        # Once sessions go quiet, the next new tenant evicts idle pools back down to the cap.
+        time.sleep(database.POOL_IDLE_SECONDS + 0.1)
+        with tenant_database("late-arrival"):
+            init_db()
+        print(f"{'':<32} after idle sweep: {open_databases()} open databases")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--max-open", type=int, default=database.MAX_OPEN_DATABASES)
+    parser.add_argument("--idle-seconds", type=float, default=1.0, help="pool idle time before eviction")
+    args = parser.parse_args()
+    database.MAX_OPEN_DATABASES = args.max_open
+    database.POOL_IDLE_SECONDS = args.idle_seconds
+
+    print(f"{args.sessions} sessions x {args.writes} single-row writes, max open databases {args.max_open}")
+    for per_tenant in (False, True):
+        with temp_database():
+            run_sessions(args.sessions, args.writes, per_tenant)
+
+
+if __name__ == "__main__":
+    main()
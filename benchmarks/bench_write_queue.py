@@ -0,0 +1,70 @@
+"""Inserts/sec from many concurrent sessions: synchronous add_expense vs the group-commit write queue.
+
+Run from the project root: python -m benchmarks.bench_write_queue [--sessions 32] [--writes 300]
+"""
+import argparse
+import threading
+import time
+from typing import Callable, List
+
+from benchmarks.common import print_row, summarize, temp_database
+from db.database import fetch_all, get_write_queue, shutdown_write_queue
+from services.expense_service import ExpenseService
+
+EXPENSE = {"date": "2026-01-15", "amount": 420.0, "category": "Food", "payment_method": "UPI", "notes": "lunch"}
+
+
+def run(label: str, sessions: int, writes: int, write: Callable[[], object]) -> None:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions + 1)
+
+    def session() -> None:
+        samples = []
+        barrier.wait()
+        for _ in range(writes):
+            start = time.perf_counter()
+            write()
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    get_write_queue().flush()
+    elapsed = time.perf_counter() - start
+
+    rows = fetch_all("SELECT COUNT(*) AS cnt FROM expenses")[0]["cnt"]
+    assert rows == sessions * writes, (rows, sessions * writes)
+    stats = summarize(latencies)
+    stats["max_us"] = max(latencies) * 1e6
+    print_row(label, stats)
+    print(f"{'':<32} {rows / elapsed:,.0f} inserts/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions x {args.writes} inserts into one database (per-call latency, microseconds)")
+    cases = [
+        ("sync add_expense", lambda: ExpenseService.add_expense(EXPENSE)),
+        # A session that needs the id waits on its future; other sessions' writes share the commit.
+        ("queue, wait for row id", lambda: ExpenseService.submit_expense(EXPENSE).result()),
+        ("queue, fire and forget", lambda: ExpenseService.submit_expense(EXPENSE)),
+    ]
+    for label, write in cases:
+        with temp_database():
+            run(label, args.sessions, args.writes, write)
+    shutdown_write_queue()
+
+
+if __name__ == "__main__":
+    main()
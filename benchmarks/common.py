@@ -0,0 +1,47 @@
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from db.database import close_all_pools, init_db, use_database
+
+
+@contextmanager
+def temp_database() -> Iterator[Path]:
+    with tempfile.TemporaryDirectory(prefix="expense-bench-") as tmp:
+        path = Path(tmp) / "bench.db"
+        use_database(path)
+        init_db()
+        try:
+            yield path
+        finally:
+            close_all_pools()
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": percentile(ordered, 0.95) * 1e6,
+    }
+
+
+def print_row(label: str, stats: Dict[str, float]) -> None:
+    cols = "  ".join(f"{k}={v:>10.1f}" for k, v in stats.items())
+    print(f"{label:<32} {cols}")
@@ -0,0 +1,36 @@
+"""Build a synthetic ledger for load-testing the dashboard.
+
+Run from the project root:
+    python -m benchmarks.generate_ledger --rows 1000000 --db data/load_test.db
+"""
+import argparse
+import time
+from pathlib import Path
+
+from db.database import init_db, use_database
+from services.expense_service import ExpenseService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--db", type=Path, default=Path("data") / "load_test.db")
+    parser.add_argument("--start", default="2018-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    use_database(args.db)
+    init_db()
+    start = time.perf_counter()
+    df = ExpenseService.generate_expenses(args.rows, start_date=args.start, seed=args.seed)
+    generated = time.perf_counter()
+    ExpenseService.bulk_insert(df)
+    loaded = time.perf_counter()
+    print(
+        f"{args.rows:,} rows -> {args.db}: generate {generated - start:.2f}s, "
+        f"load {loaded - generated:.2f}s ({args.rows / (loaded - generated):,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
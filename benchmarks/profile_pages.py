@@ -0,0 +1,63 @@
+"""Render every page headlessly against a generated ledger and append per-rerun profiles as JSON lines.
+
+Run from the project root:
+    python -m benchmarks.profile_pages --rows 100000 --label "$(git describe --always)" --out profiles.jsonl
+Compare the per-page medians printed (or stored) for two labels to spot regressions.
+"""
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from app import NAVIGATION
+from benchmarks.common import temp_database
+from profiling import PROFILER
+from services.expense_service import ExpenseService
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", default="local", help="release or commit the profiles belong to")
+    parser.add_argument("--out", type=Path, default=Path("profiles.jsonl"))
+    args = parser.parse_args()
+
+    runs = []
+    with temp_database():
+        ExpenseService.bulk_insert(ExpenseService.generate_expenses(args.rows))
+        for page in NAVIGATION:
+            app = AppTest.from_file(str(APP_PATH), default_timeout=300)
+            app.run()
+            # Only the reruns on the target page count, not the initial landing on the Dashboard.
+            PROFILER.clear()
+            for _ in range(args.repeat):
+                app.sidebar.radio[0].set_value(page).run()
+            if app.exception:
+                raise SystemExit(f"{page}: {app.exception[0].value}")
+            runs.extend(PROFILER.runs())
+    with args.out.open("a", encoding="utf-8") as out:
+        for run in runs:
+            out.write(json.dumps({"label": args.label, "rows": args.rows, **run}, default=str) + "\n")
+
+    by_page = defaultdict(list)
+    for run in runs:
+        by_page[run["page"]].append(run)
+    print(f"{args.rows:,} rows, label {args.label!r}: {len(runs)} reruns appended to {args.out}")
+    for page in NAVIGATION:
+        page_runs = by_page.get(page, [])
+        if not page_runs:
+            continue
+        median_ms = statistics.median(run["ms"] for run in page_runs)
+        queries = statistics.median(sum(span["kind"] == "query" for span in run["spans"]) for run in page_runs)
+        kb_sent = statistics.median(run["bytes_sent"] for run in page_runs) / 1024
+        print(f"  {page:<18} median {median_ms:8.1f} ms  {queries:4.0f} queries  {kb_sent:7.1f} KB sent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Headless benchmark suite for the expense, budget and analytics hot paths.
+
+Each case runs against generated ledgers (fixed seed and date span, so runs are
+comparable) and reports latency percentiles plus the peak memory traced during one
+extra call. Save results with --json and pass them back with --baseline to flag
+regressions.
+
+Run from the project root:
+    python -m benchmarks.suite [--sizes 10000 100000 1000000] [--json results.json] [--baseline old.json]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.common import percentile, temp_database
+from services.analytics_service import PLOT_CACHE, AnalyticsService
+from services.budget_service import BudgetService
+from services.expense_service import ExpenseService
+
+LEDGER_START = "2020-01-01"
+LEDGER_END = "2025-12-31"
+SEED = 42
+REPORT_MONTH = "2025-06"
+EXPENSE = {"date": "2025-06-15", "amount": 420.0, "category": "Food", "payment_method": "UPI", "notes": "bench"}
+
+
+def measure(fn: Callable[[], object], max_runs: int, budget_s: float) -> Dict[str, float]:
+    """Time fn at least 3 times and until max_runs or the time budget is used, then trace one call."""
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < 3 or (len(samples) < max_runs and time.perf_counter() - started < budget_s):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    ordered = sorted(samples)
+    return {
+        "runs": len(ordered),
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def cases() -> List[Tuple[str, Callable[[], object]]]:
+    month_start, month_end = f"{REPORT_MONTH}-01", f"{REPORT_MONTH}-30"
+    ids = ExpenseService.list_expenses(month_start, month_end, limit=1)["id"].tolist()
+    ledger = ExpenseService.list_expenses()
+    # The frame the Analytics page feeds the chart builders: daily totals per category.
+    chart_frame = ExpenseService.buckets(by=["category"])["Daily"]
+
+    def crud() -> None:
+        row_id = ExpenseService.add_expense(EXPENSE)
+        ExpenseService.get_expense(row_id)
+        ExpenseService.update_expense(row_id, {**EXPENSE, "amount": 421.0})
+        ExpenseService.delete_expense(row_id)
+
+    def uncached(chart: Callable[[], object]) -> Callable[[], object]:
+        def run() -> object:
+            PLOT_CACHE.clear()
+            return chart()
+
+        return run
+
+    return [
+        ("expense.crud_cycle", crud),
+        ("expense.get_expense", lambda: ExpenseService.get_expense(ids[0])),
+        ("expense.list_expenses.month", lambda: ExpenseService.list_expenses(month_start, month_end)),
+        ("expense.list_expenses.all", ExpenseService.list_expenses),
+        ("expense.page_expenses", lambda: ExpenseService.page_expenses(page_size=50)),
+        ("budget.monthly_progress.sql", lambda: BudgetService.monthly_progress(None, REPORT_MONTH)),
+        ("budget.monthly_progress.frame", lambda: BudgetService.monthly_progress(ledger, REPORT_MONTH)),
+        ("analytics.category_distribution", uncached(lambda: AnalyticsService.category_distribution(chart_frame))),
+        ("analytics.daily_trend", uncached(lambda: AnalyticsService.daily_trend(chart_frame, static=True))),
+        ("analytics.monthly_comparison", uncached(lambda: AnalyticsService.monthly_comparison(chart_frame, static=True))),
+    ]
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    regressions = []
+    for key, stats in results.items():
+        before = baseline.get(key)
+        if before and stats["p50_ms"] > before["p50_ms"] * (1 + tolerance) and stats["p50_ms"] - before["p50_ms"] > 0.05:
+            regressions.append(f"{key}: p50 {before['p50_ms']:.2f} -> {stats['p50_ms']:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-runs", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of timing per case")
+    parser.add_argument("--json", type=Path, help="write results here")
+    parser.add_argument("--baseline", type=Path, help="earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown vs baseline")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    header = f"{'case':<36} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10} {'peak MB':>9}"
+    for size in args.sizes:
+        with temp_database():
+            load_start = time.perf_counter()
+            ExpenseService.bulk_insert(ExpenseService.generate_expenses(size, LEDGER_START, LEDGER_END, seed=SEED))
+            print(f"\n{size:,} rows (loaded in {time.perf_counter() - load_start:.1f}s)")
+            print(header)
+            for name, fn in cases():
+                stats = measure(fn, args.max_runs, args.budget)
+                results[f"{size}:{name}"] = stats
+                print(
+                    f"{name:<36} {stats['runs']:>5} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                    f"{stats['p99_ms']:>10.2f} {stats['max_ms']:>10.2f} {stats['peak_mb']:>9.1f}"
+                )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,780 @@
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+
+from profiling import PROFILER, sql_name
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+DB_PATH = DATA_DIR / "expenses.db"
+TENANTS_DIR = DATA_DIR / "tenants"
+
+POOL_SIZE = 4
+# Databases with an open pool. Beyond this, least recently used pools that have sat idle
+# for POOL_IDLE_SECONDS are closed; busy tenants are never evicted, so the cap is soft.
+MAX_OPEN_DATABASES = 32
+POOL_IDLE_SECONDS = 30.0
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+# Opt-in background writer (EXPENSE_ASYNC_WRITES=1) that group-commits writes from all sessions.
+ASYNC_WRITES = os.environ.get("EXPENSE_ASYNC_WRITES", "") == "1"
+WRITE_BATCH_MAX = 512
+# How long the writer waits for more work before committing a partial batch.
+WRITE_BATCH_WAIT = 0.002
+# Applied once per connection when it is opened, not per query.
+CONNECTION_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+# Parameters one statement may bind; builds before SQLite 3.32 default to 999.
+MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+
+def batch_rows(width: int, limit: int) -> int:
+    """Rows per multi-row statement binding ``width`` parameters each: at most ``limit``, within MAX_VARIABLES."""
+    return max(1, min(limit, MAX_VARIABLES // width))
+
+
+def open_connection(path: Optional[Path] = None) -> sqlite3.Connection:
+    path = Path(path or DB_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived connections to a single database file.
+
+    Streamlit runs each rerun on a script thread, so connections are borrowed
+    for the duration of one call and handed back instead of being pinned to a
+    thread that may not outlive the rerun.
+    """
+
+    def __init__(self, path: Path, max_size: int = POOL_SIZE) -> None:
+        self.path = Path(path)
+        self.max_size = max_size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self.last_used = time.monotonic()
+
+    @property
+    def in_use(self) -> bool:
+        return self._opened > self._idle.qsize()
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.max_size:
+                self._opened += 1
+                try:
+                    return open_connection(self.path)
+                except Exception:
+                    self._opened -= 1
+                    raise
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        self.last_used = time.monotonic()
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_pools: "OrderedDict[Path, ConnectionPool]" = OrderedDict()
+_pools_lock = threading.Lock()
+# Databases whose schema has been created/migrated by this process.
+_initialized: Set[Path] = set()
+_initialized_lock = threading.Lock()
+
+# The ledger this thread (one Streamlit rerun) talks to; None means the shared DB_PATH.
+_current_database: ContextVar[Optional[Path]] = ContextVar("current_database", default=None)
+
+# Per-database counters bumped by every service write; read-side caches key on them.
+_data_versions: Dict[Path, int] = {}
+_data_version_lock = threading.Lock()
+
+
+def tenant_path(tenant: str) -> Path:
+    if not TENANT_ID_PATTERN.match(tenant):
+        raise ValueError(f"Invalid ledger name: {tenant!r}")
+    return TENANTS_DIR / f"{tenant}.db"
+
+
+@lru_cache(maxsize=1024)
+def _resolved(path: Path) -> Path:
+    return Path(path).resolve()
+
+
+def use_tenant(tenant: Optional[str]) -> Path:
+    """Route this thread's queries to a tenant's ledger; None selects the shared database."""
+    _current_database.set(_resolved(tenant_path(tenant)) if tenant else None)
+    return current_database()
+
+
+@contextmanager
+def tenant_database(tenant: Optional[str]) -> Iterator[Path]:
+    token = _current_database.set(_resolved(tenant_path(tenant)) if tenant else None)
+    try:
+        yield current_database()
+    finally:
+        _current_database.reset(token)
+
+
+@contextmanager
+def database_at(path: Path) -> Iterator[Path]:
+    """Route this thread's queries to ``path``, for background threads that have no session."""
+    token = _current_database.set(_resolved(path))
+    try:
+        yield current_database()
+    finally:
+        _current_database.reset(token)
+
+
+_T = TypeVar("_T")
+
+
+def bind_database(fn: Callable[[], _T]) -> Callable[[], _T]:
+    """Pin ``fn`` to this thread's database, for deferred callbacks run on another thread.
+
+    Streamlit runs deferred ``download_button`` data callables on a worker thread that does
+    not inherit the rerun's context, so they would otherwise read the shared database.
+    """
+    path = current_database()
+
+    def bound() -> _T:
+        with database_at(path):
+            return fn()
+
+    return bound
+
+
+def current_database() -> Path:
+    return _current_database.get() or _resolved(DB_PATH)
+
+
+def current_tenant() -> Optional[str]:
+    """Name of the tenant ledger this thread is routed to, or None for the shared database."""
+    path = current_database()
+    return path.stem if path.parent == _resolved(TENANTS_DIR) else None
+
+
+def data_version() -> Tuple[str, int]:
+    """Cache token for the current database: its path plus a counter bumped on every write."""
+    path = current_database()
+    return str(path), _data_versions.get(path, 0)
+
+
+def bump_data_version(path: Optional[Path] = None) -> int:
+    path = path or current_database()
+    with _data_version_lock:
+        _data_versions[path] = _data_versions.get(path, 0) + 1
+        return _data_versions[path]
+
+
+def _evict_idle_pools() -> None:
+    # Caller holds _pools_lock. The newest pool is never evicted, nor are pools still in use.
+    excess = len(_pools) - MAX_OPEN_DATABASES
+    cutoff = time.monotonic() - POOL_IDLE_SECONDS
+    for key in list(_pools)[:-1]:
+        if excess <= 0:
+            break
+        pool = _pools[key]
+        if pool.in_use or pool.last_used > cutoff:
+            continue
+        del _pools[key]
+        pool.close()
+        excess -= 1
+
+
+def get_pool(path: Optional[Path] = None) -> ConnectionPool:
+    key = _resolved(path) if path else current_database()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(key)
+            _pools[key] = pool
+            _evict_idle_pools()
+        else:
+            _pools.move_to_end(key)
+        return pool
+
+
+def open_databases() -> int:
+    with _pools_lock:
+        return len(_pools)
+
+
+def close_all_pools() -> None:
+    if _write_queue is not None:
+        _write_queue.flush()
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    with _initialized_lock:
+        _initialized.clear()
+    for pool in pools:
+        pool.close()
+
+
+def use_database(path: Path) -> None:
+    # Tenant ledgers live next to the shared database.
+    global DB_PATH, TENANTS_DIR
+    DB_PATH = Path(path)
+    TENANTS_DIR = DB_PATH.parent / "tenants"
+
+
+def get_connection() -> sqlite3.Connection:
+    # Unpooled connection for callers that manage the lifecycle themselves.
+    return open_connection(current_database())
+
+
+def init_db() -> None:
+    # Tenants are initialized lazily on first use; later reruns skip the schema checks.
+    path = current_database()
+    if path in _initialized:
+        return
+    with _initialized_lock:
+        if path in _initialized:
+            return
+        _create_schema()
+        _initialized.add(path)
+
+
+def _create_schema() -> None:
+    with get_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS expenses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                amount REAL NOT NULL,
+                category TEXT NOT NULL,
+                payment_method TEXT NOT NULL,
+                notes TEXT
+            );
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS budgets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                month TEXT NOT NULL UNIQUE,
+                budget REAL NOT NULL,
+                savings_goal REAL NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        conn.commit()
+        migrate(conn)
+
+
+# daily_rollup holds one row per (day, category, payment method); triggers keep it in step
+# with every write to expenses so dashboards read O(days) rows instead of O(transactions).
+_ROLLUP_ADD = """
+    INSERT INTO daily_rollup(day_key, month_key, category, payment_method, total, txn_count)
+    SELECT {row}.day_key, {row}.month_key, {row}.category, {row}.payment_method, {row}.amount, 1
+    WHERE {row}.day_key IS NOT NULL
+    ON CONFLICT(day_key, category, payment_method)
+    DO UPDATE SET total = total + excluded.total, txn_count = txn_count + 1;
+"""
+_ROLLUP_REMOVE = """
+    UPDATE daily_rollup SET total = total - {row}.amount, txn_count = txn_count - 1
+    WHERE day_key = {row}.day_key AND category = {row}.category AND payment_method = {row}.payment_method;
+    DELETE FROM daily_rollup
+    WHERE day_key = {row}.day_key AND category = {row}.category AND payment_method = {row}.payment_method
+    AND txn_count <= 0;
+"""
+_ROLLUP_SELECT = """
+    SELECT day_key, month_key, category, payment_method, SUM(amount), COUNT(*)
+    FROM expenses WHERE day_key IS NOT NULL
+    GROUP BY day_key, category, payment_method
+"""
+_ROLLUP_REBUILD = f"INSERT OR REPLACE INTO daily_rollup {_ROLLUP_SELECT}"
+
+# Smoothing for the forecast statistics: per month for day-of-month spend, per transaction for
+# amounts. They are baked into the triggers below, so changing them needs a new migration.
+FORECAST_MONTH_ALPHA = 0.25
+FORECAST_TXN_ALPHA = 0.05
+# Months are counted from year 0 so consecutive months differ by one across year ends.
+_STATS_MONTH = "(({row}.month_key / 100) * 12 + {row}.month_key % 100 - 1)"
+_STATS_DOM = "CAST(strftime('%d', {row}.date) AS INTEGER)"
+# (1 - alpha) ** months, looked up because SQLite's math functions are a build-time option.
+_DECAY = "COALESCE((SELECT factor FROM month_decay WHERE months = {months}), 0)"
+# category_stats and day_of_month_stats hold EWMA accumulators (weighted sum, sum of squares,
+# total weight) that each insert updates in O(1). Expenses dated before a month that was
+# already folded, and every update or delete, mark the category stale for
+# ForecastService.rebuild instead.
+_STATS_ADD = """
+    INSERT INTO category_stats(category, first_month, txn_sum, txn_sq, txn_weight, stale)
+    VALUES ({row}.category, {month}, {row}.amount, {row}.amount * {row}.amount, 1, 0)
+    ON CONFLICT(category) DO UPDATE SET
+        txn_sum = {txn_keep} * txn_sum + excluded.txn_sum,
+        txn_sq = {txn_keep} * txn_sq + excluded.txn_sq,
+        txn_weight = {txn_keep} * txn_weight + 1,
+        stale = stale OR excluded.first_month < first_month OR excluded.first_month < COALESCE(
+            (SELECT open_month FROM day_of_month_stats WHERE category = {row}.category AND dom = {dom}), 0
+        ),
+        first_month = MIN(first_month, excluded.first_month);
+    INSERT INTO day_of_month_stats(category, dom, open_month, open_total, month_sum, month_sq, month_weight)
+    SELECT {row}.category, {dom}, {month}, {row}.amount, 0, 0, (1 - {first_gap}) / {month_alpha}
+    FROM category_stats WHERE category = {row}.category
+    ON CONFLICT(category, dom) DO UPDATE SET
+        month_sum = CASE WHEN excluded.open_month > open_month
+            THEN ({month_keep} * month_sum + open_total) * {gap} ELSE month_sum END,
+        month_sq = CASE WHEN excluded.open_month > open_month
+            THEN ({month_keep} * month_sq + open_total * open_total) * {gap} ELSE month_sq END,
+        month_weight = CASE WHEN excluded.open_month > open_month
+            THEN ({month_keep} * month_weight + 1) * {gap} + (1 - {gap}) / {month_alpha} ELSE month_weight END,
+        open_total = CASE WHEN excluded.open_month > open_month THEN excluded.open_total
+            WHEN excluded.open_month = open_month THEN open_total + excluded.open_total ELSE open_total END,
+        open_month = MAX(open_month, excluded.open_month);
+"""
+_STATS_STALE = """
+    INSERT INTO category_stats(category, first_month, txn_sum, txn_sq, txn_weight, stale)
+    VALUES ({row}.category, 0, 0, 0, 0, 1) ON CONFLICT(category) DO UPDATE SET stale = 1;
+"""
+
+
+def _stats_add(row: str) -> str:
+    month = _STATS_MONTH.format(row=row)
+    return _STATS_ADD.format(
+        row=row,
+        month=month,
+        dom=_STATS_DOM.format(row=row),
+        txn_keep=1 - FORECAST_TXN_ALPHA,
+        month_keep=1 - FORECAST_MONTH_ALPHA,
+        month_alpha=FORECAST_MONTH_ALPHA,
+        # Empty months between the open month and this one count as zero spend.
+        gap=_DECAY.format(months="excluded.open_month - open_month - 1"),
+        first_gap=_DECAY.format(months=f"MAX({month} - first_month, 0)"),
+    )
+
+# Ordered schema migrations; each entry is applied once and recorded in PRAGMA user_version.
+# day_key is days since 1970-01-01 and month_key is YYYYMM, both derived from the TEXT date.
+MIGRATIONS: List[Tuple[int, Tuple[str, ...]]] = [
+    (
+        1,
+        (
+            "ALTER TABLE expenses ADD COLUMN day_key INTEGER "
+            "GENERATED ALWAYS AS (CAST(julianday(date) - 2440587.5 AS INTEGER)) VIRTUAL",
+            "ALTER TABLE expenses ADD COLUMN month_key INTEGER "
+            "GENERATED ALWAYS AS (CAST(strftime('%Y%m', date) AS INTEGER)) VIRTUAL",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_category_date ON expenses(category, date)",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_method_date ON expenses(payment_method, date)",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_day_key ON expenses(day_key)",
+            "CREATE INDEX IF NOT EXISTS idx_expenses_month_key ON expenses(month_key)",
+        ),
+    ),
+    (
+        2,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS daily_rollup (
+                day_key INTEGER NOT NULL,
+                month_key INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                payment_method TEXT NOT NULL,
+                total REAL NOT NULL,
+                txn_count INTEGER NOT NULL,
+                PRIMARY KEY (day_key, category, payment_method)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_daily_rollup_month ON daily_rollup(month_key, category)",
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_insert AFTER INSERT ON expenses "
+            f"WHEN NEW.day_key IS NOT NULL BEGIN {_ROLLUP_ADD.format(row='NEW')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_delete AFTER DELETE ON expenses "
+            f"WHEN OLD.day_key IS NOT NULL BEGIN {_ROLLUP_REMOVE.format(row='OLD')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_rollup_update "
+            f"AFTER UPDATE OF date, amount, category, payment_method ON expenses BEGIN "
+            f"{_ROLLUP_REMOVE.format(row='OLD')} {_ROLLUP_ADD.format(row='NEW')} END",
+            _ROLLUP_REBUILD,
+        ),
+    ),
+    (
+        3,
+        ("CREATE INDEX IF NOT EXISTS idx_expenses_amount ON expenses(amount)",),
+    ),
+    (
+        4,
+        (
+            # External-content FTS5 index over notes; rowid is expenses.id.
+            "CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(notes, content='expenses', content_rowid='id')",
+            "CREATE TRIGGER IF NOT EXISTS trg_expenses_fts_insert AFTER INSERT ON expenses BEGIN "
+            "INSERT INTO expenses_fts(rowid, notes) VALUES (NEW.id, NEW.notes); END",
+            "CREATE TRIGGER IF NOT EXISTS trg_expenses_fts_delete AFTER DELETE ON expenses BEGIN "
+            "INSERT INTO expenses_fts(expenses_fts, rowid, notes) VALUES ('delete', OLD.id, OLD.notes); END",
+            "CREATE TRIGGER IF NOT EXISTS trg_expenses_fts_update AFTER UPDATE OF notes ON expenses BEGIN "
+            "INSERT INTO expenses_fts(expenses_fts, rowid, notes) VALUES ('delete', OLD.id, OLD.notes); "
+            "INSERT INTO expenses_fts(rowid, notes) VALUES (NEW.id, NEW.notes); END",
+            "INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild')",
+        ),
+    ),
+    (
+        5,
+        (
+            "CREATE TABLE IF NOT EXISTS month_decay (months INTEGER PRIMARY KEY, factor REAL NOT NULL)",
+            f"""
+            INSERT OR REPLACE INTO month_decay(months, factor)
+            WITH RECURSIVE powers(months, factor) AS (
+                SELECT 0, 1.0 UNION ALL SELECT months + 1, factor * {1 - FORECAST_MONTH_ALPHA} FROM powers WHERE months < 1200
+            )
+            SELECT months, factor FROM powers
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS category_stats (
+                category TEXT PRIMARY KEY,
+                first_month INTEGER NOT NULL,
+                txn_sum REAL NOT NULL,
+                txn_sq REAL NOT NULL,
+                txn_weight REAL NOT NULL,
+                stale INTEGER NOT NULL DEFAULT 0
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS day_of_month_stats (
+                category TEXT NOT NULL,
+                dom INTEGER NOT NULL,
+                open_month INTEGER NOT NULL,
+                open_total REAL NOT NULL,
+                month_sum REAL NOT NULL,
+                month_sq REAL NOT NULL,
+                month_weight REAL NOT NULL,
+                PRIMARY KEY (category, dom)
+            ) WITHOUT ROWID
+            """,
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_stats_insert AFTER INSERT ON expenses "
+            f"WHEN NEW.day_key IS NOT NULL BEGIN {_stats_add('NEW')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_stats_delete AFTER DELETE ON expenses BEGIN "
+            f"{_STATS_STALE.format(row='OLD')} END",
+            f"CREATE TRIGGER IF NOT EXISTS trg_expenses_stats_update "
+            f"AFTER UPDATE OF date, amount, category ON expenses BEGIN "
+            f"{_STATS_STALE.format(row='OLD')} {_STATS_STALE.format(row='NEW')} END",
+            # Existing ledgers start stale and are built when the app next opens them.
+            "INSERT OR IGNORE INTO category_stats(category, first_month, txn_sum, txn_sq, txn_weight, stale) "
+            "SELECT DISTINCT category, 0, 0, 0, 0, 1 FROM expenses",
+        ),
+    ),
+    (
+        6,
+        # Row version for optimistic concurrency; every UPDATE of an expense increments it.
+        ("ALTER TABLE expenses ADD COLUMN version INTEGER NOT NULL DEFAULT 0",),
+    ),
+    (
+        7,
+        (
+            # Recurring expenses: an RFC 5545 RRULE from start_date, posted up to posted_through.
+            """
+            CREATE TABLE IF NOT EXISTS recurring_rules (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                rrule TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT,
+                amount REAL NOT NULL,
+                category TEXT NOT NULL,
+                payment_method TEXT NOT NULL,
+                notes TEXT,
+                posted_through TEXT,
+                next_due TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_recurring_rules_next_due ON recurring_rules(next_due)",
+            "ALTER TABLE expenses ADD COLUMN rule_id INTEGER REFERENCES recurring_rules(id) ON DELETE SET NULL",
+            # At most one posted expense per rule and date, whoever runs the scheduler.
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_expenses_rule_date ON expenses(rule_id, date) "
+            "WHERE rule_id IS NOT NULL",
+        ),
+    ),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    version = schema_version(conn)
+    applied = False
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        if schema_version(conn) >= target:
+            # Another session migrated while we waited for the write lock.
+            conn.rollback()
+            version = schema_version(conn)
+            continue
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        version = target
+        applied = True
+    if applied:
+        conn.execute("ANALYZE")
+        conn.commit()
+    return version
+
+
+def rebuild_rollups() -> None:
+    with transaction() as conn:
+        conn.execute("DELETE FROM daily_rollup")
+        conn.execute(_ROLLUP_REBUILD)
+
+
+def verify_rollups(tolerance: float = 0.005) -> List[Tuple[Any, ...]]:
+    """Recompute the rollup from raw expenses and return rows that disagree with the stored one."""
+    return [
+        tuple(row)
+        for row in fetch_all(
+            f"""
+            WITH fresh(day_key, month_key, category, payment_method, total, txn_count) AS ({_ROLLUP_SELECT})
+            SELECT f.day_key, f.category, f.payment_method, f.total, r.total, f.txn_count, r.txn_count
+            FROM fresh f LEFT JOIN daily_rollup r USING (day_key, category, payment_method)
+            WHERE r.total IS NULL OR ABS(f.total - r.total) > ? OR f.txn_count != r.txn_count
+            UNION ALL
+            SELECT r.day_key, r.category, r.payment_method, NULL, r.total, NULL, r.txn_count
+            FROM daily_rollup r LEFT JOIN fresh f USING (day_key, category, payment_method)
+            WHERE f.total IS NULL
+            """,
+            (tolerance,),
+        )
+    ]
+
+
+def explain_query_plan(query: str, params: Tuple[Any, ...] = ()) -> List[str]:
+    rows = fetch_all(f"EXPLAIN QUERY PLAN {query}", params)
+    return [row["detail"] for row in rows]
+
+
+def fetch_all(query: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+    with PROFILER.span("query", sql_name(query)) as span, get_pool().connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+        span["rows"] = len(rows)
+        return rows
+
+
+def fetch_tuples(query: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+    """fetch_all without sqlite3.Row wrappers, for result sets large enough that they matter."""
+    with PROFILER.span("query", sql_name(query)) as span, get_pool().connection() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        rows = cur.execute(query, params).fetchall()
+        span["rows"] = len(rows)
+        return rows
+
+
+def execute(query: str, params: Tuple[Any, ...] = ()) -> int:
+    with PROFILER.span("write", sql_name(query)) as span, get_pool().connection() as conn:
+        cur = conn.execute(query, params)
+        conn.commit()
+        span["rows"] = cur.rowcount
+        return cur.lastrowid
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run several statements on one pooled connection and commit them atomically."""
+    with get_pool().connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def execute_many(query: str, params_seq: Iterable[Sequence[Any]]) -> int:
+    with PROFILER.span("write", sql_name(query)) as span, transaction() as conn:
+        cur = conn.executemany(query, params_seq)
+        span["rows"] = cur.rowcount
+        return cur.rowcount
+
+
+# (database, query, params, future); a None query is a flush marker.
+_Write = Tuple[Optional[Path], Optional[str], Tuple[Any, ...], Future]
+_STOP = object()
+
+
+class WriteQueue:
+    """Single background writer that turns writes from every session into group commits.
+
+    Each write runs in its own savepoint, so a failing statement only fails its own
+    future. Futures resolve to the row id once the batch holding them is committed.
+    """
+
+    def __init__(self, max_batch: int = WRITE_BATCH_MAX, max_wait: float = WRITE_BATCH_WAIT) -> None:
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, query: str, params: Sequence[Any] = ()) -> "Future[int]":
+        future: "Future[int]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Write queue is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="expense-writer", daemon=True)
+                self._thread.start()
+        # The database is captured here; the writer thread has no session context.
+        self._queue.put((current_database(), query, tuple(params), future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every write submitted so far has been committed (or failed)."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        marker: Future = Future()
+        self._queue.put((None, None, (), marker))
+        marker.result(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            self._commit([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    @staticmethod
+    def _commit(batch: List[_Write]) -> None:
+        by_database: "OrderedDict[Path, List[_Write]]" = OrderedDict()
+        markers = []
+        for item in batch:
+            if item[1] is None:
+                markers.append(item[3])
+            else:
+                by_database.setdefault(item[0], []).append(item)
+
+        for path, writes in by_database.items():
+            row_ids = []
+            try:
+                with get_pool(path).connection() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for _, query, params, future in writes:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        conn.execute("SAVEPOINT queued_write")
+                        try:
+                            cur = conn.execute(query, params)
+                        except Exception as exc:
+                            conn.execute("ROLLBACK TO queued_write")
+                            future.set_exception(exc)
+                        else:
+                            row_ids.append((future, cur.lastrowid))
+                        conn.execute("RELEASE queued_write")
+                    conn.commit()
+            except Exception as exc:
+                for _, _, _, future in writes:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            bump_data_version(path)
+            for future, row_id in row_ids:
+                future.set_result(row_id)
+
+        for marker in markers:
+            marker.set_result(None)
+
+
+_write_queue: Optional[WriteQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteQueue:
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteQueue()
+            atexit.register(shutdown_write_queue)
+        return _write_queue
+
+
+def shutdown_write_queue(timeout: Optional[float] = 30.0) -> None:
+    """Commit everything still queued and stop the writer; registered with atexit."""
+    global _write_queue
+    with _write_queue_lock:
+        write_queue, _write_queue = _write_queue, None
+    if write_queue is not None:
+        write_queue.close(timeout)
@@ -0,0 +1,151 @@
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Reruns kept per session, and sessions kept; the least recently profiled session is dropped first.
+MAX_RUNS = 100
+MAX_SESSIONS = 32
+# Query text is shortened to this many characters in span names.
+SQL_NAME_CHARS = 80
+
+
+def _row_count(value: Any) -> Optional[int]:
+    # Lists of rows, DataFrames, Series and arrays; pandas is not imported here. Tuples are
+    # multi-value returns such as a chart's (png, figure), not rows.
+    if isinstance(value, list) or hasattr(value, "shape"):
+        return len(value)
+    return None
+
+
+def _frontend_context() -> Any:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+
+class Profiler:
+    """Collects timing spans per Streamlit rerun: queries, pandas work, chart renders and pages.
+
+    Spans are only recorded inside ``run()``; outside a rerun (benchmarks, scripts) the
+    hooks cost one context-variable lookup. Runs are kept per session, and each session
+    decides for itself whether its reruns are recorded.
+    """
+
+    def __init__(self, max_runs: int = MAX_RUNS, max_sessions: int = MAX_SESSIONS) -> None:
+        self.max_runs = max_runs
+        self.max_sessions = max_sessions
+        self._runs: "OrderedDict[Optional[str], Deque[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("profiler_run", default=None)
+
+    @contextmanager
+    def run(self, page: str = "", enabled: bool = True) -> Iterator[Optional[Dict[str, Any]]]:
+        if not enabled:
+            yield None
+            return
+        ctx = _frontend_context()
+        record: Dict[str, Any] = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "session": getattr(ctx, "session_id", None),
+            "page": page,
+            "bytes_sent": 0,
+            "spans": [],
+        }
+        # Count the serialized size of every message this rerun sends to the browser.
+        original_enqueue = getattr(ctx, "_enqueue", None)
+        if original_enqueue is not None:
+
+            def counting_enqueue(msg: Any) -> None:
+                record["bytes_sent"] += msg.ByteSize()
+                original_enqueue(msg)
+
+            ctx._enqueue = counting_enqueue
+        token = self._current.set(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            self._current.reset(token)
+            if original_enqueue is not None:
+                ctx._enqueue = original_enqueue
+            with self._lock:
+                runs = self._runs.pop(record["session"], None) or deque(maxlen=self.max_runs)
+                runs.append(record)
+                self._runs[record["session"]] = runs
+                while len(self._runs) > self.max_sessions:
+                    self._runs.popitem(last=False)
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[Dict[str, Any]]:
+        record = self._current.get()
+        if record is None:
+            yield {}
+            return
+        span: Dict[str, Any] = {"kind": kind, "name": name, "rows": None, "bytes_sent": 0}
+        bytes_before = record["bytes_sent"]
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            span["bytes_sent"] = record["bytes_sent"] - bytes_before
+            record["spans"].append(span)
+
+    def timed(self, kind: str, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of span(); rows come from the result, else from the first DataFrame argument."""
+
+        def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self._current.get() is None:
+                    return fn(*args, **kwargs)
+                with self.span(kind, label) as span:
+                    result = fn(*args, **kwargs)
+                    rows = _row_count(result)
+                    if rows is None:
+                        rows = next((len(arg) for arg in args if hasattr(arg, "columns")), None)
+                    span["rows"] = rows
+                    return result
+
+            return wrapper
+
+        return decorator
+
+    def runs(self, session: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded runs of one session, or of every session when ``session`` is None."""
+        with self._lock:
+            if session is not None:
+                return list(self._runs.get(session, ()))
+            return [run for runs in self._runs.values() for run in runs]
+
+    def clear(self, session: Optional[str] = None) -> None:
+        with self._lock:
+            if session is None:
+                self._runs.clear()
+            else:
+                self._runs.pop(session, None)
+
+    def to_jsonl(self, session: Optional[str] = None) -> str:
+        return "".join(json.dumps(run, default=str) + "\n" for run in self.runs(session))
+
+
+def current_session() -> Optional[str]:
+    return getattr(_frontend_context(), "session_id", None)
+
+
+def sql_name(query: str) -> str:
+    return " ".join(query.split())[:SQL_NAME_CHARS]
+
+
+PROFILER = Profiler()
@@ -0,0 +1,311 @@
+import contextvars
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from db.database import current_tenant, fetch_all
+from profiling import PROFILER
+from services.downsample_service import MAX_BARS, MAX_LINE_POINTS, DownsampleService
+from services.resample_service import ResampleService
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+PLOTS_DIR = Path(__file__).resolve().parent.parent / "plots"
+SCREEN_DPI = 100
+EXPORT_DPI = 200
+PLOT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Bar label column and formatter for each granularity monthly_comparison can fall back to.
+PERIOD_LABELS: Dict[str, Tuple[str, Callable[[pd.Series], pd.Series]]] = {
+    "Monthly": ("month", lambda dates: dates.dt.strftime("%Y-%m")),
+    "Quarterly": ("quarter", lambda dates: dates.dt.year.astype(str) + "-Q" + dates.dt.quarter.astype(str)),
+    "Yearly": ("year", lambda dates: dates.dt.strftime("%Y")),
+}
+CHARTS = ("category_distribution", "daily_trend", "monthly_comparison")
+# One worker per chart by default; EXPENSE_CHART_WORKERS=1 builds them one after another.
+CHART_WORKERS = int(os.environ.get("EXPENSE_CHART_WORKERS", len(CHARTS)))
+
+
+class PlotCache:
+    """Content-addressed LRU of rendered PNGs, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = PLOT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+            return png
+
+    def put(self, key: str, png: bytes) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = png
+            self._size += len(png)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+PLOT_CACHE = PlotCache()
+
+_chart_pool: Optional[ThreadPoolExecutor] = None
+_chart_pool_lock = threading.Lock()
+_backend_lock = threading.Lock()
+
+
+def _chart_executor() -> ThreadPoolExecutor:
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            _chart_pool = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart")
+        return _chart_pool
+
+
+# Matplotlib and Plotly are imported on first use so pages without charts skip their import cost.
+def _new_figure(figsize: Tuple[float, float]) -> "Figure":
+    import matplotlib
+
+    # Chart workers may get here together; Figure objects on Agg are safe per thread, backend selection is not.
+    with _backend_lock:
+        matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize)
+
+
+def _content_key(name: str, data: Union[pd.Series, pd.DataFrame], dpi: int) -> str:
+    digest = hashlib.sha1(pd.util.hash_pandas_object(data, index=True).values.tobytes()).hexdigest()
+    return f"{name}:{dpi}:{digest}"
+
+
+def _render_png(
+    name: str,
+    data: Union[pd.Series, pd.DataFrame],
+    dpi: int,
+    draw: Callable[..., "Figure"],
+    save_to: Optional[Path] = None,
+) -> bytes:
+    """Cached PNG of ``draw(data)``; a fresh render is also written to ``save_to/<name>.png``."""
+    # Saved renders are cached per directory, so each ledger's file is written once.
+    key = _content_key(name, data, dpi) + (f"@{save_to}" if save_to is not None else "")
+    png = PLOT_CACHE.get(key)
+    if png is None:
+        with PROFILER.span("render", f"{name} png @{dpi}dpi") as span:
+            buf = io.BytesIO()
+            draw(data).savefig(buf, format="png", dpi=dpi)
+            png = buf.getvalue()
+            span["rows"] = len(data)
+        PLOT_CACHE.put(key, png)
+        if save_to is not None:
+            save_to.mkdir(parents=True, exist_ok=True)
+            (save_to / f"{name}.png").write_bytes(png)
+    return png
+
+
+class AnalyticsService:
+    @staticmethod
+    def _load_dataframe() -> pd.DataFrame:
+        rows = fetch_all("SELECT * FROM expenses")
+        df = pd.DataFrame(rows, columns=rows[0].keys() if rows else [])
+        if df.empty:
+            return df
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    @staticmethod
+    def monthly_summary(month: str) -> pd.DataFrame:
+        df = AnalyticsService._load_dataframe()
+        if df.empty:
+            return df
+        months = ResampleService.period_ordinals(ResampleService.day_keys(df["date"]), "Monthly")
+        return df[months == ResampleService.month_ordinal(month)]
+
+    @staticmethod
+    def _category_breakdown(df: pd.DataFrame) -> pd.Series:
+        return df.groupby("category")["amount"].sum().sort_values(ascending=False)
+
+    @staticmethod
+    def _daily_totals(df: pd.DataFrame) -> pd.DataFrame:
+        return ResampleService.resample(df, "Daily")[["date", "amount"]]
+
+    @staticmethod
+    def _monthly_totals(df: pd.DataFrame) -> pd.DataFrame:
+        """Totals per month, or per quarter or year when there would be more than MAX_BARS months."""
+        days = df["day_key"].to_numpy() if "day_key" in df else ResampleService.day_keys(df["date"])
+        freq = ResampleService.auto_frequency(days, MAX_BARS, ("Monthly", "Quarterly", "Yearly"))
+        totals = ResampleService.resample(df, freq)
+        # The first column names the period, so the drawing code can title the chart from it.
+        period, labels = PERIOD_LABELS[freq]
+        return pd.DataFrame({period: labels(totals["date"]), "amount": totals["amount"]})
+
+    @staticmethod
+    def _draw_category_distribution(breakdown: pd.Series) -> "Figure":
+        fig = _new_figure((6, 4))
+        ax = fig.subplots()
+        breakdown.plot(kind="pie", autopct="%1.1f%%", startangle=90, ax=ax)
+        ax.set_ylabel("")
+        ax.set_title("Category Distribution")
+        fig.tight_layout()
+        return fig
+
+    @staticmethod
+    def _draw_daily_trend(trend: pd.DataFrame) -> "Figure":
+        fig = _new_figure((6, 4))
+        ax = fig.subplots()
+        ax.plot(trend["date"], trend["amount"], marker="o")
+        ax.set_title("Daily Spending Trend")
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Amount")
+        ax.grid(True, linestyle="--", alpha=0.5)
+        fig.autofmt_xdate()
+        fig.tight_layout()
+        return fig
+
+    @staticmethod
+    def _draw_monthly_comparison(monthly: pd.DataFrame) -> "Figure":
+        period = monthly.columns[0]
+        fig = _new_figure((8, 5))
+        ax = fig.subplots()
+        bars = ax.bar(monthly[period], monthly["amount"], color="#4C72B0")
+        ax.set_title(f"{period.title()}-wise Spend")
+        ax.set_xlabel(period.title())
+        ax.set_ylabel("Amount")
+        ax.tick_params(axis="x", rotation=45, labelsize=9)
+
+        if len(monthly) <= 12:
+            for rect, val in zip(bars, monthly["amount"]):
+                ax.text(rect.get_x() + rect.get_width() / 2, val + max(monthly["amount"]) * 0.01, f"{val:,.0f}", ha="center", va="bottom", fontsize=8)
+
+        fig.tight_layout()
+        return fig
+
+    @staticmethod
+    @PROFILER.timed("chart")
+    def category_distribution(
+        df: pd.DataFrame, dpi: int = SCREEN_DPI, save_to: Optional[Path] = None
+    ) -> Tuple[Optional[bytes], pd.Series]:
+        if df.empty:
+            return None, pd.Series(dtype=float)
+        breakdown = AnalyticsService._category_breakdown(df)
+        png = _render_png("category_distribution", breakdown, dpi, AnalyticsService._draw_category_distribution, save_to)
+        return png, breakdown
+
+    @staticmethod
+    @PROFILER.timed("chart")
+    def daily_trend(df: pd.DataFrame, static: bool = False, dpi: int = SCREEN_DPI, save_to: Optional[Path] = None):
+        if df.empty:
+            return None, None
+        import plotly.express as px
+
+        trend = AnalyticsService._daily_totals(df)
+        png = _render_png("daily_trend", trend, dpi, AnalyticsService._draw_daily_trend, save_to) if static else None
+        # The PNG keeps every day; the browser figure is capped at MAX_LINE_POINTS.
+        shown = DownsampleService.downsample(trend, max_points=MAX_LINE_POINTS)
+        title = "Daily Spending Trend"
+        if len(shown) < len(trend):
+            title += f" ({len(shown):,} of {len(trend):,} days shown)"
+        plotly_fig = px.line(shown, x="date", y="amount", title=title)
+        return png, plotly_fig
+
+    @staticmethod
+    @PROFILER.timed("chart")
+    def monthly_comparison(df: pd.DataFrame, static: bool = False, dpi: int = SCREEN_DPI, save_to: Optional[Path] = None):
+        if df.empty:
+            return None, None
+        import plotly.express as px
+
+        monthly = AnalyticsService._monthly_totals(df)
+        png = (
+            _render_png("monthly_comparison", monthly, dpi, AnalyticsService._draw_monthly_comparison, save_to)
+            if static
+            else None
+        )
+
+        period = monthly.columns[0]
+        plotly_fig = px.bar(monthly, x=period, y="amount", title=f"{period.title()}-wise Spend")
+        plotly_fig.update_layout(xaxis_tickangle=-45, bargap=0.2)
+        if len(monthly) > 12:
+            plotly_fig.update_traces(text=None)
+        else:
+            plotly_fig.update_traces(texttemplate="%{y:,.0f}", textposition="outside")
+        return png, plotly_fig
+
+    @staticmethod
+    def build_charts(
+        df: pd.DataFrame,
+        names: Sequence[str] = CHARTS,
+        static: bool = False,
+        dpi: int = SCREEN_DPI,
+    ) -> Tuple[Dict[str, Tuple[Optional[bytes], Any]], Dict[str, float]]:
+        """Build independent charts concurrently on the chart pool.
+
+        Returns each chart's ``(png, figure_or_breakdown)`` result and its build time in ms.
+        """
+        builders: Dict[str, Callable[[], Tuple[Optional[bytes], Any]]] = {
+            "category_distribution": lambda: AnalyticsService.category_distribution(df, dpi=dpi),
+            "daily_trend": lambda: AnalyticsService.daily_trend(df, static=static, dpi=dpi),
+            "monthly_comparison": lambda: AnalyticsService.monthly_comparison(df, static=static, dpi=dpi),
+        }
+
+        def timed(build: Callable[[], Tuple[Optional[bytes], Any]]) -> Tuple[Tuple[Optional[bytes], Any], float]:
+            start = time.perf_counter()
+            result = build()
+            return result, (time.perf_counter() - start) * 1000
+
+        pool = _chart_executor()
+        # Each job runs in a copy of the caller's context, so profiler spans land in this rerun.
+        futures = {name: pool.submit(contextvars.copy_context().run, timed, builders[name]) for name in names}
+        results: Dict[str, Tuple[Optional[bytes], Any]] = {}
+        timings: Dict[str, float] = {}
+        for name, future in futures.items():
+            results[name], timings[name] = future.result()
+        return results, timings
+
+    @staticmethod
+    @PROFILER.timed("chart")
+    def export_png(name: str, df: pd.DataFrame) -> bytes:
+        """Render a report-quality PNG for one chart, saved when freshly rendered.
+
+        Files go to plots/ for the shared ledger and plots/<ledger>/ for a tenant's, so sessions
+        on different ledgers never overwrite each other's exports.
+        """
+        tenant = current_tenant()
+        save_to = PLOTS_DIR / tenant if tenant else PLOTS_DIR
+        if name == "category_distribution":
+            png, _ = AnalyticsService.category_distribution(df, dpi=EXPORT_DPI, save_to=save_to)
+        elif name == "daily_trend":
+            png, _ = AnalyticsService.daily_trend(df, static=True, dpi=EXPORT_DPI, save_to=save_to)
+        elif name == "monthly_comparison":
+            png, _ = AnalyticsService.monthly_comparison(df, static=True, dpi=EXPORT_DPI, save_to=save_to)
+        else:
+            raise ValueError(f"Unknown chart: {name}")
+        return png or b""
+
+    @staticmethod
+    def export_custom_range(start_date: str, end_date: str) -> pd.DataFrame:
+        df = AnalyticsService._load_dataframe()
+        if df.empty:
+            return df
+        mask = (df["date"] >= pd.to_datetime(start_date)) & (df["date"] <= pd.to_datetime(end_date))
+        return df.loc[mask]
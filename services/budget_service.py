@@ -0,0 +1,139 @@
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from db.database import bump_data_version, execute, fetch_all, get_pool
+from services.resample_service import ResampleService
+
+
+class LookupCache:
+    """Thread-safe read-through cache for small, rarely written lookup rows.
+
+    Every write bumps a generation counter, so a reader that loaded a row before
+    the write cannot store that now-stale value afterwards.
+    """
+
+    def __init__(self) -> None:
+        self._values: Dict[Hashable, Any] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            generation = self._generation
+        value = load()
+        with self._lock:
+            if generation == self._generation:
+                self._values[key] = value
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+
+# Shared by every session in the process; keys include the database path.
+LOOKUP_CACHE = LookupCache()
+
+
+class BudgetService:
+    DEFAULT_ALERT_THRESHOLD = 0.8
+
+    @staticmethod
+    def set_budget(month: str, budget: float, savings_goal: float) -> None:
+        execute(
+            "INSERT INTO budgets(month, budget, savings_goal) VALUES (?, ?, ?) ON CONFLICT(month) DO UPDATE SET budget=excluded.budget, savings_goal=excluded.savings_goal",
+            (month, budget, savings_goal),
+        )
+        LOOKUP_CACHE.invalidate((get_pool().path, "budgets", month))
+        bump_data_version()
+
+    @staticmethod
+    def _load_budget(month: str) -> Optional[dict]:
+        rows = fetch_all("SELECT * FROM budgets WHERE month=?", (month,))
+        if not rows:
+            return None
+        return dict(rows[0])
+
+    @staticmethod
+    def get_budget(month: str) -> Optional[dict]:
+        row = LOOKUP_CACHE.get((get_pool().path, "budgets", month), lambda: BudgetService._load_budget(month))
+        return dict(row) if row else None
+
+    @staticmethod
+    def save_setting(key: str, value: str) -> None:
+        execute(
+            "INSERT INTO settings(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+            (key, value),
+        )
+        LOOKUP_CACHE.invalidate((get_pool().path, "settings", key))
+
+    @staticmethod
+    def _load_setting(key: str) -> Optional[str]:
+        rows = fetch_all("SELECT value FROM settings WHERE key=?", (key,))
+        return rows[0]["value"] if rows else None
+
+    @staticmethod
+    def get_setting(key: str, default: Optional[str] = None) -> Optional[str]:
+        value = LOOKUP_CACHE.get((get_pool().path, "settings", key), lambda: BudgetService._load_setting(key))
+        return default if value is None else value
+
+    @staticmethod
+    def spending_alert(spent: float, budget: float) -> Optional[str]:
+        if budget <= 0:
+            return None
+        threshold = float(BudgetService.get_setting("alert_threshold", str(BudgetService.DEFAULT_ALERT_THRESHOLD)))
+        if spent >= budget * threshold:
+            pct = spent / budget * 100
+            return f"Alert: You have used {pct:.1f}% of your budget for the month."
+        return None
+
+    @staticmethod
+    def projection_alert(forecast: Dict[str, Any], budget: float) -> Optional[str]:
+        """Warn when ForecastService.month_forecast expects the month to end over budget."""
+        if budget <= 0 or forecast["projected"] <= budget or forecast["spent"] >= budget:
+            return None
+        return (
+            f"Projected month-end spend ₹{forecast['projected']:,.0f} "
+            f"(90% range ₹{forecast['low']:,.0f} – ₹{forecast['high']:,.0f}) exceeds the budget by "
+            f"₹{forecast['projected'] - budget:,.0f}."
+        )
+
+    @staticmethod
+    def month_spent(month: str) -> float:
+        try:
+            parsed = datetime.strptime(month, "%Y-%m")
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Month must be in YYYY-MM format, got {month!r}.") from exc
+        month_key = parsed.year * 100 + parsed.month
+        rows = fetch_all("SELECT COALESCE(SUM(total), 0) AS spent FROM daily_rollup WHERE month_key=?", (month_key,))
+        return float(rows[0]["spent"])
+
+    @staticmethod
+    def monthly_progress(df: Optional[pd.DataFrame], month: str) -> Dict[str, float]:
+        if df is None:
+            spent = BudgetService.month_spent(month)
+        elif df.empty:
+            return {"spent": 0.0, "budget": 0.0, "savings_goal": 0.0, "remaining": 0.0}
+        else:
+            days = df["day_key"].to_numpy() if "day_key" in df else ResampleService.day_keys(df["date"])
+            months = ResampleService.period_ordinals(days, "Monthly")
+            spent = float(df["amount"].to_numpy()[months == ResampleService.month_ordinal(month)].sum())
+        budget_entry = BudgetService.get_budget(month)
+        budget = budget_entry.get("budget", 0.0) if budget_entry else 0.0
+        savings_goal = budget_entry.get("savings_goal", 0.0) if budget_entry else 0.0
+        remaining = max(budget - spent, 0.0)
+        return {
+            "spent": spent,
+            "budget": budget,
+            "savings_goal": savings_goal,
+            "remaining": remaining,
+        }
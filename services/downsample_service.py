@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from profiling import PROFILER
+
+# Point budgets that keep chart JSON small whatever the date range.
+MAX_LINE_POINTS = 500
+MAX_BARS = 48
+
+
+def _numeric(values: pd.Series) -> np.ndarray:
+    # Datetimes are compared as nanosecond integers; LTTB only needs relative distances.
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    return values.to_numpy(dtype=np.float64)
+
+
+class DownsampleService:
+    """Point-budget decimation for line charts, returning row positions to keep."""
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets: keeps the first and last points plus one per bucket."""
+        n = len(x)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        # threshold - 2 buckets over the interior points, each at least one point wide.
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+        widths = np.diff(edges)
+        mean_x = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / widths
+        mean_y = np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / widths
+        keep = np.empty(threshold, dtype=np.int64)
+        keep[0], keep[-1] = 0, n - 1
+        anchor = 0
+        for bucket in range(threshold - 2):
+            lo, hi = edges[bucket], edges[bucket + 1]
+            # The third triangle corner is the next bucket's mean, or the last point.
+            if bucket + 1 < threshold - 2:
+                next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+            else:
+                next_x, next_y = x[-1], y[-1]
+            areas = np.abs(
+                (x[anchor] - next_x) * (y[lo:hi] - y[anchor]) - (x[anchor] - x[lo:hi]) * (next_y - y[anchor])
+            )
+            anchor = lo + int(areas.argmax())
+            keep[bucket + 1] = anchor
+        return keep
+
+    @staticmethod
+    def min_max(y: np.ndarray, threshold: int) -> np.ndarray:
+        """First, last, and the min and max of (threshold - 2) / 2 equal-count buckets, in order."""
+        n = len(y)
+        if threshold >= n or threshold < 4:
+            return np.arange(n)
+        y = np.asarray(y, dtype=np.float64)
+        edges = np.linspace(0, n, (threshold - 2) // 2 + 1).astype(np.int64)
+        picks = [0, n - 1]
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            picks.append(lo + int(y[lo:hi].argmin()))
+            picks.append(lo + int(y[lo:hi].argmax()))
+        return np.unique(picks)
+
+    @staticmethod
+    @PROFILER.timed("pandas")
+    def downsample(
+        frame: pd.DataFrame,
+        x: str = "date",
+        y: str = "amount",
+        max_points: int = MAX_LINE_POINTS,
+        method: str = "lttb",
+    ) -> pd.DataFrame:
+        """At most ``max_points`` rows of a frame sorted by ``x``; smaller frames are returned as is."""
+        if len(frame) <= max_points:
+            return frame
+        if method == "lttb":
+            keep = DownsampleService.lttb(_numeric(frame[x]), _numeric(frame[y]), max_points)
+        elif method == "minmax":
+            keep = DownsampleService.min_max(_numeric(frame[y]), max_points)
+        else:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        return frame.iloc[keep]
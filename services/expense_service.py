@@ -0,0 +1,636 @@
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from constants import CATEGORIES, PAYMENT_METHODS
+from db.database import (
+    batch_rows,
+    bump_data_version,
+    data_version,
+    execute,
+    execute_many,
+    fetch_all,
+    fetch_tuples,
+    get_write_queue,
+    transaction,
+)
+from profiling import PROFILER
+from services.forecast_service import ForecastService
+from services.resample_service import FREQUENCIES, ResampleService
+
+EXPENSE_COLUMNS = ["id", "date", "amount", "category", "payment_method", "notes"]
+# Column types of ExpenseService.load_frame; category and payment_method hold label codes.
+FRAME_DTYPE = [
+    ("id", np.int64),
+    ("day_key", np.int32),
+    ("amount", np.float64),
+    ("category", np.int16),
+    ("payment_method", np.int16),
+]
+# Columns load_frame adds on request, after the FRAME_DTYPE ones.
+OPTIONAL_DTYPES = {"notes": object, "version": np.int64}
+# Columns the Manage Expenses editor can change, in the order save_edits writes them.
+EDITABLE_COLUMNS = ["date", "amount", "category", "payment_method", "notes"]
+# Rows per UPDATE in save_edits, capped by batch_rows to stay under SQLite's parameter limit.
+EDIT_BATCH_ROWS = 500
+# Rows per INSERT in bulk_insert, capped by batch_rows on older SQLite builds: the search index
+# flushes after every statement, so one statement per row slows imports down as the ledger grows.
+INSERT_BATCH_ROWS = 500
+INSERT_EXPENSE = "INSERT INTO expenses(date, amount, category, payment_method, notes) VALUES (?, ?, ?, ?, ?)"
+# Sort keys accepted by ExpenseService.page_expenses; each pairs with id for keyset pagination.
+SORT_COLUMNS = {"date": "date", "amount": "amount"}
+# Dimensions accepted by ExpenseService.aggregate, mapped to the indexed column they group on.
+GROUP_BY_COLUMNS = {
+    "date": "day_key",
+    "month": "month_key",
+    "category": "category",
+    "payment_method": "payment_method",
+}
+
+# Relative frequency and typical ticket size used by the synthetic ledger generator.
+CATEGORY_WEIGHTS = np.array([0.22, 0.24, 0.16, 0.09, 0.06, 0.08, 0.03, 0.12])
+CATEGORY_MEDIAN_SPEND = {
+    "Groceries": 900.0,
+    "Food": 350.0,
+    "Transport": 250.0,
+    "Entertainment": 600.0,
+    "Health": 800.0,
+    "Utilities": 1500.0,
+    "Rent": 15000.0,
+    "Other": 500.0,
+}
+PAYMENT_WEIGHTS = np.array([0.45, 0.15, 0.25, 0.08, 0.07])
+
+
+def _as_key(values: Optional[Sequence[Any]]) -> Optional[Tuple[Any, ...]]:
+    return None if values is None else tuple(values)
+
+
+def _fts_query(text: Optional[str]) -> str:
+    """Turn free text into an FTS5 query: every term must match, each as a prefix."""
+    terms = (text or "").split()
+    return " AND ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def _day_key(value: Any) -> int:
+    return int((pd.Timestamp(value).normalize() - pd.Timestamp("1970-01-01")).days)
+
+
+def _expense_params(data: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (data["date"], float(data["amount"]), data["category"], data["payment_method"], data.get("notes", ""))
+
+
+def _editable(frame: pd.DataFrame) -> pd.DataFrame:
+    # Editor output mixes dates, Timestamps and categoricals; compare everything as stored values.
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d"),
+            "amount": pd.to_numeric(frame["amount"]).round(2),
+            "category": frame["category"].astype(object),
+            "payment_method": frame["payment_method"].astype(object),
+            "notes": frame["notes"].astype(object).fillna(""),
+        },
+        index=frame.index,
+    )
+
+
+def _labels(column: str, known: List[str]) -> List[str]:
+    """Category labels for a column: the constants first, then any other values in the ledger."""
+    # Loose index scan: one seek per distinct value on the (column, date) index, not a full scan.
+    present = [
+        row[0]
+        for row in fetch_tuples(
+            f"WITH RECURSIVE labels(value) AS (SELECT MIN({column}) FROM expenses UNION ALL "
+            f"SELECT (SELECT MIN({column}) FROM expenses WHERE {column} > value) FROM labels WHERE value IS NOT NULL) "
+            "SELECT value FROM labels WHERE value IS NOT NULL"
+        )
+    ]
+    return known + sorted(set(present) - set(known))
+
+
+def _code_case(column: str, labels: List[str]) -> Tuple[str, List[Any]]:
+    # SQLite maps each label to its code, so rows arrive as small ints instead of repeated strings.
+    whens = " ".join("WHEN ? THEN ?" for _ in labels)
+    params: List[Any] = []
+    for code, label in enumerate(labels):
+        params.extend((label, code))
+    return f"CASE {column} {whens} ELSE -1 END", params
+
+
+def _after_write() -> None:
+    # Edits, deletes and back-dated inserts mark forecast statistics stale; rebuilding them here,
+    # on the write path, keeps the Dashboard's forecast reads from ever taking the write lock.
+    bump_data_version()
+    ForecastService.rebuild()
+
+
+class ExpenseService:
+    @staticmethod
+    def add_expense(data: Dict[str, Any]) -> int:
+        row_id = execute(INSERT_EXPENSE, _expense_params(data))
+        _after_write()
+        return row_id
+
+    @staticmethod
+    def submit_expense(data: Dict[str, Any]) -> "Future[int]":
+        """Queue an insert on the background writer; the future resolves to the row id after commit."""
+        return get_write_queue().submit(INSERT_EXPENSE, _expense_params(data))
+
+    @staticmethod
+    def update_expense(expense_id: int, data: Dict[str, Any]) -> None:
+        execute(
+            "UPDATE expenses SET date=?, amount=?, category=?, payment_method=?, notes=?, version=version+1 WHERE id=?",
+            (
+                data["date"],
+                float(data["amount"]),
+                data["category"],
+                data["payment_method"],
+                data.get("notes", ""),
+                expense_id,
+            ),
+        )
+        _after_write()
+
+    @staticmethod
+    def update_expenses(rows: List[Dict[str, Any]]) -> int:
+        updated = execute_many(
+            "UPDATE expenses SET date=?, amount=?, category=?, payment_method=?, notes=?, version=version+1 WHERE id=?",
+            [
+                (
+                    row["date"],
+                    float(row["amount"]),
+                    row["category"],
+                    row["payment_method"],
+                    row.get("notes", ""),
+                    int(row["id"]),
+                )
+                for row in rows
+            ],
+        )
+        _after_write()
+        return updated
+
+    @staticmethod
+    def diff_edits(original: pd.DataFrame, edited: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Changed cells between a data_editor's input and output, one entry per changed row.
+
+        ``original`` needs the ``version`` column from ``list_expenses(..., with_version=True)``.
+        Each entry is ``{"id", "version", "changes": {column: new value}}``.
+        """
+        before = _editable(original.set_index("id"))
+        after = _editable(edited.set_index("id")).reindex(before.index)
+        changed = ((before != after) & after.notna()).to_numpy()
+        rows = changed.any(axis=1)
+        ids = before.index.to_numpy()[rows]
+        versions = original.set_index("id")["version"].reindex(before.index).to_numpy()[rows]
+        values = after.to_numpy(dtype=object)[rows]
+        columns = list(after.columns)
+        return [
+            {
+                "id": int(expense_id),
+                "version": int(version),
+                "changes": {column: value for column, value, moved in zip(columns, cells, mask) if moved},
+            }
+            for expense_id, version, cells, mask in zip(ids, versions, values, changed[rows])
+        ]
+
+    @staticmethod
+    def save_edits(edits: List[Dict[str, Any]]) -> Tuple[List[int], List[int]]:
+        """Write diff_edits output atomically; returns (saved ids, ids changed elsewhere since read).
+
+        Rows changing the same columns share one UPDATE ... FROM (VALUES ...) statement, which
+        only touches rows still at the version they were read at and only sets changed columns,
+        so rollup and search triggers fire for the columns that actually moved.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for edit in edits:
+            columns = tuple(column for column in EDITABLE_COLUMNS if column in edit["changes"])
+            groups.setdefault(columns, []).append(edit)
+        saved: List[int] = []
+        with PROFILER.span("write", "ExpenseService.save_edits") as span, transaction() as conn:
+            for columns, rows in groups.items():
+                size = batch_rows(len(columns) + 2, EDIT_BATCH_ROWS)
+                for offset in range(0, len(rows), size):
+                    chunk = rows[offset : offset + size]
+                    placeholders = ", ".join(["(" + ", ".join("?" * (len(columns) + 2)) + ")"] * len(chunk))
+                    query = (
+                        f"WITH edits(id, version, {', '.join(columns)}) AS (VALUES {placeholders}) "
+                        f"UPDATE expenses SET {', '.join(f'{column} = edits.{column}' for column in columns)}, "
+                        "version = expenses.version + 1 "
+                        "FROM edits WHERE expenses.id = edits.id AND expenses.version = edits.version "
+                        "RETURNING expenses.id"
+                    )
+                    params = [
+                        value
+                        for row in chunk
+                        for value in (row["id"], row["version"], *(row["changes"][column] for column in columns))
+                    ]
+                    saved.extend(row[0] for row in conn.execute(query, params).fetchall())
+            span["rows"] = len(saved)
+        if saved:
+            _after_write()
+        saved_ids = set(saved)
+        return sorted(saved_ids), sorted(edit["id"] for edit in edits if edit["id"] not in saved_ids)
+
+    @staticmethod
+    def delete_expense(expense_id: int) -> None:
+        execute("DELETE FROM expenses WHERE id=?", (expense_id,))
+        _after_write()
+
+    @staticmethod
+    def delete_expenses(expense_ids: List[int]) -> int:
+        deleted = execute_many("DELETE FROM expenses WHERE id=?", [(int(eid),) for eid in expense_ids])
+        _after_write()
+        return deleted
+
+    @staticmethod
+    def where_clause(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[int]] = None,
+        by_day_key: bool = False,
+        search: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for op, bound in ((">=", start), ("<=", end)):
+            if bound is None:
+                continue
+            if by_day_key:
+                clauses.append(f"day_key {op} ?")
+                params.append(_day_key(bound))
+            else:
+                clauses.append(f"date {op} ?")
+                params.append(pd.Timestamp(bound).strftime("%Y-%m-%d"))
+        for column, values in (("category", categories), ("payment_method", methods), ("id", ids)):
+            if values is None:
+                continue
+            values = list(values)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})" if values else "0")
+            params.extend(values)
+        match = _fts_query(search)
+        if match:
+            clauses.append("id IN (SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH ?)")
+            params.append(match)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def load_frame(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[int]] = None,
+        limit: Optional[int] = None,
+        with_notes: bool = False,
+        with_version: bool = False,
+    ) -> pd.DataFrame:
+        """Compact expense frame: int32 day_key, categorical category/payment_method, notes only on request."""
+        category_labels = _labels("category", CATEGORIES)
+        method_labels = _labels("payment_method", PAYMENT_METHODS)
+        category_sql, category_params = _code_case("category", category_labels)
+        method_sql, method_params = _code_case("payment_method", method_labels)
+        where, params = ExpenseService.where_clause(start, end, categories, methods, ids)
+        optional = [column for column, wanted in (("notes", with_notes), ("version", with_version)) if wanted]
+        optional_sql = "".join(f", {column}" for column in optional)
+        query = (
+            f"SELECT id, COALESCE(day_key, -1), amount, {category_sql}, {method_sql}{optional_sql} "
+            f"FROM expenses{where} ORDER BY date DESC, id DESC"
+        )
+        params = category_params + method_params + params
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        # Rows with an unparseable date have no day_key; -1 keeps the column integer.
+        dtype = FRAME_DTYPE + [(column, OPTIONAL_DTYPES[column]) for column in optional]
+        # One structured-array pass over the tuples is several times faster than transposing them.
+        records = np.array(fetch_tuples(query, tuple(params)), dtype=dtype)
+        frame = pd.DataFrame(
+            {
+                "id": records["id"],
+                "day_key": records["day_key"],
+                "amount": records["amount"],
+                "category": pd.Categorical.from_codes(records["category"], category_labels),
+                "payment_method": pd.Categorical.from_codes(records["payment_method"], method_labels),
+            }
+        )
+        for column in optional:
+            frame[column] = records[column]
+        return frame
+
+    @staticmethod
+    def load_notes(ids: Sequence[int]) -> pd.Series:
+        """Notes for the given expense ids, indexed by id; pairs with load_frame(with_notes=False)."""
+        if not len(ids):
+            return pd.Series(dtype=object, name="notes")
+        where, params = ExpenseService.where_clause(ids=[int(i) for i in ids])
+        rows = fetch_tuples(f"SELECT id, notes FROM expenses{where}", tuple(params))
+        return pd.Series(dict(rows), name="notes", dtype=object).reindex(ids)
+
+    @staticmethod
+    def list_expenses(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[int]] = None,
+        limit: Optional[int] = None,
+        with_notes: bool = True,
+        with_version: bool = False,
+    ) -> pd.DataFrame:
+        """load_frame with a datetime ``date`` column in place of ``day_key``, for display and editing."""
+        df = ExpenseService.load_frame(start, end, categories, methods, ids, limit, with_notes, with_version)
+        # day_key is an integer day number, so no string date parsing is needed.
+        day_keys = df.pop("day_key")
+        df.insert(1, "date", pd.to_datetime(day_keys.where(day_keys >= 0), unit="D"))
+        return df
+
+    @staticmethod
+    def page_expenses(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        sort_by: str = "date",
+        descending: bool = True,
+        after: Optional[Tuple[Any, int]] = None,
+        page_size: int = 50,
+    ) -> Tuple[pd.DataFrame, Optional[Tuple[Any, int]]]:
+        """One page of expenses using keyset pagination on (sort column, id).
+
+        Returns the page and the cursor to pass as ``after`` for the next page,
+        or None when this is the last page.
+        """
+        column = SORT_COLUMNS[sort_by]
+        direction, op = ("DESC", "<") if descending else ("ASC", ">")
+        where, params = ExpenseService.where_clause(start, end, categories, methods, search=search)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + f"({column}, id) {op} (?, ?)"
+            params.extend(after)
+        rows = fetch_all(
+            f"SELECT id, day_key, amount, category, payment_method, notes, {column} AS sort_key "
+            f"FROM expenses{where} ORDER BY {column} {direction}, id {direction} LIMIT ?",
+            tuple(params) + (page_size + 1,),
+        )
+        page = rows[:page_size]
+        df = pd.DataFrame([tuple(row)[:-1] for row in page], columns=EXPENSE_COLUMNS)
+        df["date"] = pd.to_datetime(df["date"], unit="D")
+        next_cursor = (page[-1]["sort_key"], page[-1]["id"]) if len(rows) > page_size else None
+        return df, next_cursor
+
+    @staticmethod
+    def search_expense_ids(text: str, limit: Optional[int] = None) -> List[int]:
+        match = _fts_query(text)
+        if not match:
+            return []
+        query = "SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH ?"
+        params: Tuple[Any, ...] = (match,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (int(limit),)
+        return [row[0] for row in fetch_all(query, params)]
+
+    @staticmethod
+    def count_expenses(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        if not search:
+            return int(ExpenseService.aggregate(start, end, categories, methods)["count"].iloc[0])
+        where, params = ExpenseService.where_clause(start, end, categories, methods, search=search)
+        return fetch_all(f"SELECT COUNT(*) AS cnt FROM expenses{where}", tuple(params))[0]["cnt"]
+
+    @staticmethod
+    def aggregate(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        group_by: Sequence[str] = (),
+    ) -> pd.DataFrame:
+        """Sum, mean and count of amounts, one row per group, read from the daily rollup table."""
+        unknown = set(group_by) - set(GROUP_BY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unsupported group_by dimension(s): {sorted(unknown)}")
+        where, params = ExpenseService.where_clause(start, end, categories, methods, by_day_key=True)
+        keys = [f"{GROUP_BY_COLUMNS[dim]} AS {dim}" for dim in group_by]
+        metrics = ["SUM(total)", "SUM(total) / SUM(txn_count)", "SUM(txn_count)"]
+        query = f"SELECT {', '.join(keys + metrics)} FROM daily_rollup{where}"
+        if group_by:
+            key_list = ", ".join(GROUP_BY_COLUMNS[dim] for dim in group_by)
+            query += f" GROUP BY {key_list} ORDER BY {key_list}"
+        rows = fetch_all(query, tuple(params))
+        df = pd.DataFrame(rows, columns=list(group_by) + ["sum", "mean", "count"])
+        if "date" in df:
+            df["date"] = pd.to_datetime(df["date"], unit="D")
+        if "month" in df:
+            df["month"] = pd.to_datetime(df["month"].astype(str), format="%Y%m").dt.strftime("%Y-%m")
+        if not group_by:
+            df = df.fillna({"sum": 0.0, "mean": 0.0, "count": 0})
+        return df
+
+    @staticmethod
+    def daily_totals(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        by: Sequence[str] = ("category", "payment_method"),
+    ) -> pd.DataFrame:
+        """Daily rollup rows (day_key, *by, amount, count) for the resampling engine."""
+        unknown = set(by) - {"category", "payment_method"}
+        if unknown:
+            raise ValueError(f"Unsupported group_by dimension(s): {sorted(unknown)}")
+        where, params = ExpenseService.where_clause(start, end, categories, methods, by_day_key=True)
+        keys = ", ".join(["day_key", *by])
+        if len(set(by)) == 2:
+            # Already the rollup's own grain; no need to regroup.
+            query = f"SELECT {keys}, total, txn_count FROM daily_rollup{where}"
+        else:
+            query = f"SELECT {keys}, SUM(total), SUM(txn_count) FROM daily_rollup{where} GROUP BY {keys}"
+        # Plain tuples instead of sqlite3.Row: this can be ~100k rows on a large ledger.
+        rows = fetch_tuples(query, tuple(params))
+        df = pd.DataFrame.from_records(rows, columns=["day_key", *by, "amount", "count"])
+        return df.astype({"day_key": np.int32, "amount": np.float64, "count": np.int64})
+
+    @staticmethod
+    def buckets(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        by: Sequence[str] = (),
+        dense: bool = False,
+        freqs: Sequence[str] = FREQUENCIES,
+    ) -> Dict[str, pd.DataFrame]:
+        """Totals per period and ``by`` group for each of ``freqs`` (Daily, Weekly, Monthly by default)."""
+        frame = ExpenseService.daily_totals(start, end, categories, methods, by)
+        return ResampleService.resample_all(frame, by, freqs, dense)
+
+    @staticmethod
+    @PROFILER.timed("frame")
+    def cached_expenses(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[int]] = None,
+        limit: Optional[int] = None,
+        with_notes: bool = True,
+    ) -> pd.DataFrame:
+        """list_expenses served from memory until the next write."""
+        return ExpenseService._cached_expenses(
+            data_version(), start, end, _as_key(categories), _as_key(methods), _as_key(ids), limit, with_notes
+        )
+
+    @staticmethod
+    @st.cache_data(max_entries=32, show_spinner=False)
+    def _cached_expenses(version, start, end, categories, methods, ids, limit, with_notes) -> pd.DataFrame:
+        return ExpenseService.list_expenses(start, end, categories, methods, ids, limit, with_notes)
+
+    @staticmethod
+    @PROFILER.timed("frame")
+    def cached_aggregate(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        group_by: Sequence[str] = (),
+    ) -> pd.DataFrame:
+        return ExpenseService._cached_aggregate(
+            data_version(), start, end, _as_key(categories), _as_key(methods), tuple(group_by)
+        )
+
+    @staticmethod
+    @st.cache_data(max_entries=64, show_spinner=False)
+    def _cached_aggregate(version, start, end, categories, methods, group_by) -> pd.DataFrame:
+        return ExpenseService.aggregate(start, end, categories, methods, group_by)
+
+    @staticmethod
+    @PROFILER.timed("frame")
+    def cached_buckets(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        methods: Optional[Sequence[str]] = None,
+        by: Sequence[str] = (),
+        dense: bool = False,
+        freqs: Sequence[str] = FREQUENCIES,
+    ) -> Dict[str, pd.DataFrame]:
+        return ExpenseService._cached_buckets(
+            data_version(), start, end, _as_key(categories), _as_key(methods), tuple(by), dense, tuple(freqs)
+        )
+
+    @staticmethod
+    @st.cache_data(max_entries=32, show_spinner=False)
+    def _cached_buckets(version, start, end, categories, methods, by, dense, freqs) -> Dict[str, pd.DataFrame]:
+        return ExpenseService.buckets(start, end, categories, methods, by, dense, freqs)
+
+    @staticmethod
+    def date_bounds() -> Optional[Tuple[date, date]]:
+        row = fetch_all(
+            "SELECT (SELECT MIN(day_key) FROM expenses) AS first, (SELECT MAX(day_key) FROM expenses) AS last"
+        )[0]
+        if row["first"] is None:
+            return None
+        epoch = date(1970, 1, 1)
+        return epoch + timedelta(days=row["first"]), epoch + timedelta(days=row["last"])
+
+    @staticmethod
+    def get_expense(expense_id: int) -> Optional[Dict[str, Any]]:
+        rows = fetch_all("SELECT * FROM expenses WHERE id=?", (expense_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        return dict(row)
+
+    @staticmethod
+    def bulk_insert(df: pd.DataFrame) -> int:
+        if df.empty:
+            return 0
+        notes = df["notes"].fillna("") if "notes" in df else pd.Series("", index=df.index)
+        rows = list(
+            zip(
+                df["date"].astype(str).tolist(),
+                df["amount"].astype(float).tolist(),
+                df["category"].astype(str).tolist(),
+                df["payment_method"].astype(str).tolist(),
+                notes.astype(str).tolist(),
+            )
+        )
+        inserted = 0
+        with PROFILER.span("write", "ExpenseService.bulk_insert") as span, transaction() as conn:
+            size = batch_rows(len(rows[0]), INSERT_BATCH_ROWS)
+            for offset in range(0, len(rows), size):
+                chunk = rows[offset : offset + size]
+                query = INSERT_EXPENSE.replace("(?, ?, ?, ?, ?)", ", ".join(["(?, ?, ?, ?, ?)"] * len(chunk)))
+                inserted += conn.execute(query, [value for row in chunk for value in row]).rowcount
+            span["rows"] = inserted
+        _after_write()
+        return inserted
+
+    @staticmethod
+    def generate_expenses(
+        n_rows: int,
+        start_date: str = "2020-01-01",
+        end_date: Optional[str] = None,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        start = np.datetime64(start_date, "D")
+        end = np.datetime64(end_date or datetime.today().date().isoformat(), "D")
+        span = max(int((end - start).astype(int)), 0) + 1
+        dates = np.sort(start + rng.integers(0, span, size=n_rows).astype("timedelta64[D]"))
+
+        cat_idx = rng.choice(len(CATEGORIES), size=n_rows, p=CATEGORY_WEIGHTS)
+        pay_idx = rng.choice(len(PAYMENT_METHODS), size=n_rows, p=PAYMENT_WEIGHTS)
+        medians = np.array([CATEGORY_MEDIAN_SPEND[c] for c in CATEGORIES])[cat_idx]
+        # Log-normal spend around a per-category median, scaled for INR-like amounts.
+        amounts = np.round(medians * rng.lognormal(0.0, 0.6, size=n_rows), 2)
+
+        categories = pd.Categorical.from_codes(cat_idx, CATEGORIES)
+        return pd.DataFrame(
+            {
+                "date": pd.Series(dates).dt.strftime("%Y-%m-%d"),
+                "amount": amounts,
+                "category": categories,
+                "payment_method": pd.Categorical.from_codes(pay_idx, PAYMENT_METHODS),
+                "notes": pd.Series(categories).astype(str).str.lower().radd("Generated ")
+                + " #"
+                + pd.Series(np.arange(1, n_rows + 1)).astype(str),
+            }
+        )
+
+    @staticmethod
+    def seed_sample_data() -> None:
+        if fetch_all("SELECT COUNT(*) as cnt FROM expenses")[0]["cnt"] > 0:
+            return
+        start_date = datetime.strptime("2025-01-01", "%Y-%m-%d").date()
+        end_date = datetime.today().date()
+
+        i = np.arange(100)
+        dates = pd.date_range(start=start_date, end=end_date, periods=100)
+        categories = np.array(CATEGORIES)[i % len(CATEGORIES)]
+        # Scaled for INR-like spends
+        amounts = np.round(300 + (i % 9) * 120 + (i % 5) * 40 + (i % 7) * 25 + (i % 3) * 15, 2)
+        ExpenseService.bulk_insert(
+            pd.DataFrame(
+                {
+                    "date": dates.strftime("%Y-%m-%d"),
+                    "amount": amounts,
+                    "category": categories,
+                    "payment_method": np.array(PAYMENT_METHODS)[i % len(PAYMENT_METHODS)],
+                    "notes": [f"Auto-sample #{n + 1} for {c.lower()}" for n, c in zip(i, categories)],
+                }
+            )
+        )
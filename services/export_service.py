@@ -0,0 +1,90 @@
+import gzip
+import io
+from typing import IO, Any, Iterator, Optional, Sequence
+
+import pandas as pd
+
+from db.database import get_pool
+from services.expense_service import ExpenseService
+
+EXPORT_COLUMNS = ["id", "date", "amount", "category", "payment_method", "notes"]
+CHUNK_ROWS = 50_000
+
+EXPORT_FORMATS = {
+    "CSV": {"suffix": "csv", "mime": "text/csv"},
+    "CSV (gzip)": {"suffix": "csv.gz", "mime": "application/gzip"},
+    "Parquet": {"suffix": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+
+class ExportService:
+    @staticmethod
+    def iter_chunks(
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+        chunk_rows: int = CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        where, params = ExpenseService.where_clause(start, end, categories)
+        with get_pool().connection() as conn:
+            cur = conn.execute(
+                f"SELECT {', '.join(EXPORT_COLUMNS)} FROM expenses{where} ORDER BY date, id", tuple(params)
+            )
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+
+    @staticmethod
+    def _write_csv(chunks: Iterator[pd.DataFrame], out: IO[bytes]) -> None:
+        header = True
+        for chunk in chunks:
+            out.write(chunk.to_csv(index=False, header=header).encode("utf-8"))
+            header = False
+        if header:
+            out.write((",".join(EXPORT_COLUMNS) + "\n").encode("utf-8"))
+
+    @staticmethod
+    def _write_parquet(chunks: Iterator[pd.DataFrame], out: IO[bytes]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("date", pa.date32()),
+                ("amount", pa.float64()),
+                ("category", pa.string()),
+                ("payment_method", pa.string()),
+                ("notes", pa.string()),
+            ]
+        )
+        with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+            for chunk in chunks:
+                chunk["date"] = pd.to_datetime(chunk["date"], format="%Y-%m-%d").dt.date
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+    @staticmethod
+    def export(
+        fmt: str,
+        start: Any = None,
+        end: Any = None,
+        categories: Optional[Sequence[str]] = None,
+    ) -> bytes:
+        """Stream matching expenses from SQLite into the export file, one chunk at a time.
+
+        Returns bytes, the one form st.download_button accepts for any size of export.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        chunks = ExportService.iter_chunks(start, end, categories)
+        out = io.BytesIO()
+        if fmt == "Parquet":
+            ExportService._write_parquet(chunks, out)
+        elif fmt == "CSV (gzip)":
+            with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+                ExportService._write_csv(chunks, gz)
+        else:
+            ExportService._write_csv(chunks, out)
+        return out.getvalue()
@@ -0,0 +1,198 @@
+import calendar
+import math
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from db.database import (
+    FORECAST_MONTH_ALPHA,
+    FORECAST_TXN_ALPHA,
+    bump_data_version,
+    fetch_all,
+    fetch_tuples,
+    transaction,
+)
+
+# z-score above which a transaction is flagged as unusual for its category.
+ANOMALY_Z = 3.0
+# Transactions of EWMA weight a category needs before its amounts are scored.
+MIN_TXN_WEIGHT = 10.0
+# Two-sided 90% band around the month-end projection.
+BAND_Z = 1.645
+
+
+def _month_index(month: str) -> int:
+    try:
+        parsed = datetime.strptime(month, "%Y-%m")
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Month must be in YYYY-MM format, got {month!r}.") from exc
+    return parsed.year * 12 + parsed.month - 1
+
+
+def _ewma(values: np.ndarray, keep: float) -> Tuple[float, float, float]:
+    """Weighted sum, sum of squares and total weight of ``values``, newest last."""
+    weights = keep ** np.arange(len(values) - 1, -1, -1, dtype=np.float64)
+    return float(weights @ values), float(weights @ (values * values)), float(weights.sum())
+
+
+class ForecastService:
+    """Month-end projection and anomaly scoring from trigger-maintained EWMA statistics.
+
+    Inserts keep ``category_stats`` and ``day_of_month_stats`` current in O(1); edits,
+    deletes and back-dated inserts mark a category stale, and the service method that wrote
+    them rebuilds it. Reads never rebuild: until then they use the category's last statistics.
+    """
+
+    @staticmethod
+    def rebuild(categories: Optional[Sequence[str]] = None) -> int:
+        """Recompute the statistics of the given (default: stale) categories from scratch."""
+        if categories is None:
+            # Checked outside the transaction so that the common case never takes the write lock.
+            categories = [row[0] for row in fetch_tuples("SELECT category FROM category_stats WHERE stale = 1")]
+        if not categories:
+            return 0
+        month_keep = 1 - FORECAST_MONTH_ALPHA
+        with transaction() as conn:
+            for category in categories:
+                conn.execute("DELETE FROM category_stats WHERE category = ?", (category,))
+                conn.execute("DELETE FROM day_of_month_stats WHERE category = ?", (category,))
+                amounts = np.array(
+                    [row[0] for row in conn.execute(
+                        "SELECT amount FROM expenses WHERE category = ? AND day_key IS NOT NULL ORDER BY id", (category,)
+                    )],
+                    dtype=np.float64,
+                )
+                if not amounts.size:
+                    continue
+                days = conn.execute(
+                    "SELECT day_key, SUM(total) FROM daily_rollup WHERE category = ? GROUP BY day_key", (category,)
+                ).fetchall()
+                day_keys = np.array([day for day, _ in days], dtype=np.int64).astype("datetime64[D]")
+                totals = np.array([total for _, total in days], dtype=np.float64)
+                months = day_keys.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+                doms = (day_keys - day_keys.astype("datetime64[M]")).astype(np.int64) + 1
+                first_month = int(months.min())
+                conn.execute(
+                    "INSERT INTO category_stats(category, first_month, txn_sum, txn_sq, txn_weight, stale) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (category, first_month, *_ewma(amounts, 1 - FORECAST_TXN_ALPHA)),
+                )
+                rows = []
+                for dom in np.unique(doms):
+                    dom_months, dom_totals = months[doms == dom], totals[doms == dom]
+                    open_month = int(dom_months.max())
+                    # Closed months from the category's first month up to the open one; gaps are zeros.
+                    closed = np.zeros(open_month - first_month)
+                    before = dom_months < open_month
+                    closed[dom_months[before] - first_month] = dom_totals[before]
+                    rows.append(
+                        (category, int(dom), open_month, float(dom_totals[~before].sum()), *_ewma(closed, month_keep))
+                    )
+                conn.executemany(
+                    "INSERT INTO day_of_month_stats(category, dom, open_month, open_total, month_sum, month_sq, month_weight) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        bump_data_version()
+        return len(categories)
+
+    @staticmethod
+    def _category_stats() -> pd.DataFrame:
+        rows = fetch_tuples("SELECT category, txn_sum, txn_sq, txn_weight FROM category_stats")
+        stats = pd.DataFrame(rows, columns=["category", "sum", "sq", "weight"]).set_index("category")
+        weight = stats["weight"].where(stats["weight"] >= MIN_TXN_WEIGHT)
+        mean = stats["sum"] / weight
+        std = np.sqrt((stats["sq"] / weight - mean**2).clip(lower=0))
+        return pd.DataFrame({"mean": mean, "std": std.where(std > 0)})
+
+    @staticmethod
+    def score(category: str, amount: float) -> Optional[float]:
+        """z-score of one amount against its category's recent transactions, or None while warming up."""
+        rows = fetch_all("SELECT txn_sum, txn_sq, txn_weight FROM category_stats WHERE category = ?", (category,))
+        if not rows or rows[0]["txn_weight"] < MIN_TXN_WEIGHT:
+            return None
+        mean = rows[0]["txn_sum"] / rows[0]["txn_weight"]
+        std = math.sqrt(max(rows[0]["txn_sq"] / rows[0]["txn_weight"] - mean * mean, 0.0))
+        return (float(amount) - mean) / std if std else None
+
+    @staticmethod
+    def anomalies(df: pd.DataFrame, threshold: float = ANOMALY_Z) -> pd.DataFrame:
+        """Rows of an expense frame whose amount is at least ``threshold`` deviations above normal."""
+        if df.empty:
+            return df.assign(z_score=pd.Series(dtype=float))
+        stats = ForecastService._category_stats()
+        categories = df["category"].astype(object)
+        mean = categories.map(stats["mean"]).astype(float)
+        std = categories.map(stats["std"]).astype(float)
+        scored = df.assign(z_score=(df["amount"] - mean) / std)
+        return scored[scored["z_score"] >= threshold].sort_values("z_score", ascending=False)
+
+    @staticmethod
+    def month_forecast(month: str, today: Optional[date] = None) -> Dict[str, Any]:
+        """Spend so far, projected month-end spend and a 90% band, overall and per category.
+
+        Days after ``today`` are projected from each category's EWMA spend on that day of the
+        month; a month already over is its actual spend, a future month is projected whole.
+        """
+        today = today or date.today()
+        target, current = _month_index(month), today.year * 12 + today.month - 1
+        days_in_month = calendar.monthrange(target // 12, target % 12 + 1)[1]
+        last_known = today.day if target == current else (days_in_month if target < current else 0)
+        rows = fetch_tuples(
+            "SELECT category, dom, open_month, open_total, month_sum, month_sq, month_weight FROM day_of_month_stats"
+        )
+        stats = pd.DataFrame(rows, columns=["category", "dom", "open", "open_total", "sum", "sq", "weight"])
+        if target < current or stats.empty:
+            spent = float(
+                fetch_all(
+                    "SELECT COALESCE(SUM(total), 0) AS spent FROM daily_rollup WHERE month_key = ?",
+                    (target // 12 * 100 + target % 12 + 1,),
+                )[0]["spent"]
+            )
+            return {"spent": spent, "projected": spent, "low": spent, "high": spent, "by_category": pd.DataFrame()}
+
+        # Fold each open month into the statistics as of the forecast month; empty months count as
+        # zero spend. Months after the current one have no data yet, so folding stops there.
+        horizon = min(target, current)
+        keep = 1 - FORECAST_MONTH_ALPHA
+        closes = stats["open"] < horizon
+        gap = keep ** (horizon - stats["open"] - 1).clip(lower=0)
+        month_sum = np.where(closes, (keep * stats["sum"] + stats["open_total"]) * gap, stats["sum"])
+        month_sq = np.where(closes, (keep * stats["sq"] + stats["open_total"] ** 2) * gap, stats["sq"])
+        weight = np.where(closes, (keep * stats["weight"] + 1) * gap + (1 - gap) / FORECAST_MONTH_ALPHA, stats["weight"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(weight > 0, month_sum / weight, 0.0)
+            var = np.where(weight > 0, np.maximum(month_sq / weight - mean**2, 0.0), 0.0)
+
+        ahead = (stats["dom"] > last_known) & (stats["dom"] <= days_in_month)
+        frame = pd.DataFrame(
+            {
+                "category": stats["category"],
+                "spent": np.where(stats["open"] == target, stats["open_total"], 0.0),
+                "expected": np.where(ahead, mean, 0.0),
+                "variance": np.where(ahead, var, 0.0),
+            }
+        )
+        by_category = frame.groupby("category", as_index=False)[["spent", "expected", "variance"]].sum()
+        by_category["projected"] = by_category["spent"] + by_category["expected"]
+        spent = float(by_category["spent"].sum())
+        projected = float(by_category["projected"].sum())
+        spread = BAND_Z * math.sqrt(float(by_category["variance"].sum()))
+        return {
+            "spent": spent,
+            "projected": projected,
+            "low": max(projected - spread, spent),
+            "high": projected + spread,
+            "by_category": by_category[["category", "spent", "projected"]].sort_values("projected", ascending=False),
+        }
+
+    @staticmethod
+    def suggest_budget(month: str, today: Optional[date] = None) -> Optional[float]:
+        """Projected month-end spend plus one standard deviation, rounded up to ₹100; None without history."""
+        forecast = ForecastService.month_forecast(month, today)
+        if forecast["by_category"].empty:
+            return None
+        one_sd = (forecast["high"] - forecast["projected"]) / BAND_Z
+        return float(math.ceil((forecast["projected"] + one_sd) / 100) * 100)
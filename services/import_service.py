@@ -0,0 +1,201 @@
+import time
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from constants import CATEGORIES, PAYMENT_METHODS
+from db.database import fetch_tuples
+from services.expense_service import ExpenseService
+
+IMPORT_COLUMNS = ["date", "amount", "category", "payment_method", "notes"]
+REQUIRED_COLUMNS = ["date", "amount", "category", "payment_method"]
+CHUNK_ROWS = 50_000
+# Date formats offered on the Import page; None infers one format for the whole file.
+DATE_FORMATS: Dict[str, Optional[str]] = {
+    "Auto-detect": None,
+    "YYYY-MM-DD": "ISO8601",
+    "DD/MM/YYYY": "%d/%m/%Y",
+    "MM/DD/YYYY": "%m/%d/%Y",
+    "DD-MM-YYYY": "%d-%m-%Y",
+    "DD Mon YYYY": "%d %b %Y",
+}
+
+Source = Union[str, Path, IO[bytes]]
+ProgressCallback = Callable[[float, str], None]
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """64-bit hash of (date, amount, notes) used to spot duplicate transactions."""
+    return pd.util.hash_pandas_object(df[["date", "amount", "notes"]], index=False).to_numpy()
+
+
+def _column_name(column: Any) -> str:
+    return str(column).strip().lower().replace(" ", "_")
+
+
+def _parse_dates(values: pd.Series, date_format: str) -> pd.Series:
+    return pd.to_datetime(values, errors="coerce", format=date_format)
+
+
+class ImportService:
+    @staticmethod
+    def infer_date_format(values: pd.Series) -> str:
+        """The one format in DATE_FORMATS that reads the most dates; raises if day and month are ambiguous."""
+        values = values[values.astype(str).str.strip() != ""]
+        parsed = {fmt: _parse_dates(values, fmt) for fmt in DATE_FORMATS.values() if fmt is not None}
+        counts = {fmt: int(dates.notna().sum()) for fmt, dates in parsed.items()}
+        best = max(counts.values(), default=0)
+        if best == 0:
+            return "ISO8601"
+        candidates: List[str] = [fmt for fmt, count in counts.items() if count == best]
+        if any(not parsed[fmt].equals(parsed[candidates[0]]) for fmt in candidates[1:]):
+            raise ValueError(
+                "Dates such as "
+                f"{values.iloc[0]!r} could be day-first or month-first; choose the file's date format."
+            )
+        return candidates[0]
+
+    @staticmethod
+    def detect_format(name: str) -> str:
+        return "parquet" if str(name).lower().endswith((".parquet", ".pq")) else "csv"
+
+    @staticmethod
+    def iter_chunks(source: Source, fmt: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+
+    @staticmethod
+    def normalize(chunk: pd.DataFrame, errors: Dict[str, int], date_format: str = "ISO8601") -> pd.DataFrame:
+        """Coerce one raw chunk to the expenses schema and drop rows that fail validation.
+
+        Every date must match ``date_format``; rows in any other format count as invalid dates.
+        """
+        chunk = chunk.rename(columns=_column_name)
+        missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+        if missing:
+            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+        if "notes" not in chunk:
+            chunk["notes"] = ""
+
+        dates = _parse_dates(chunk["date"], date_format)
+        amounts = pd.to_numeric(
+            chunk["amount"].astype(str).str.replace(r"[,\s₹]", "", regex=True), errors="coerce"
+        ).round(2)
+        categories = chunk["category"].astype(str).str.strip()
+        methods = chunk["payment_method"].astype(str).str.strip()
+        checks = {
+            "invalid date": dates.isna(),
+            "invalid amount": amounts.isna() | (amounts <= 0),
+            "unknown category": ~categories.isin(CATEGORIES),
+            "unknown payment method": ~methods.isin(PAYMENT_METHODS),
+        }
+        bad = np.zeros(len(chunk), dtype=bool)
+        for reason, mask in checks.items():
+            mask = mask.to_numpy() & ~bad
+            if mask.any():
+                errors[reason] = errors.get(reason, 0) + int(mask.sum())
+            bad |= mask
+
+        keep = ~bad
+        return pd.DataFrame(
+            {
+                "date": dates[keep].dt.strftime("%Y-%m-%d"),
+                "amount": amounts[keep].astype(float),
+                "category": categories[keep],
+                "payment_method": methods[keep],
+                "notes": chunk["notes"][keep].fillna("").astype(str).str.strip(),
+            }
+        ).reset_index(drop=True)
+
+    @staticmethod
+    def _existing_hashes(first: str, last: str) -> Set[int]:
+        """Hashes of the ledger rows dated first..last, read through the date index."""
+        rows = fetch_tuples(
+            "SELECT date, amount, COALESCE(notes, '') FROM expenses WHERE date BETWEEN ? AND ?", (first, last)
+        )
+        if not rows:
+            return set()
+        existing = pd.DataFrame.from_records(rows, columns=["date", "amount", "notes"])
+        existing["amount"] = existing["amount"].round(2)
+        return set(_row_hashes(existing).tolist())
+
+    @staticmethod
+    def import_file(
+        source: Source,
+        fmt: Optional[str] = None,
+        chunk_rows: int = CHUNK_ROWS,
+        progress: Optional[ProgressCallback] = None,
+        date_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Stream a CSV/Parquet statement into expenses, one transaction per chunk.
+
+        ``date_format`` is a value of DATE_FORMATS; by default it is inferred from the first chunk.
+        """
+        fmt = fmt or ImportService.detect_format(getattr(source, "name", source))
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as handle:
+                return ImportService.import_file(handle, fmt, chunk_rows, progress, date_format)
+
+        # Progress is measured in bytes consumed for CSV and in rows for Parquet.
+        source.seek(0, 2)
+        total_bytes = source.tell()
+        source.seek(0)
+        total_rows = None
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            total_rows = pq.ParquetFile(source).metadata.num_rows
+            source.seek(0)
+
+        report: Dict[str, Any] = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "errors": {}}
+        start = time.perf_counter()
+        # Hashes of the ledger days the statement has reached so far, plus everything imported.
+        seen: Set[int] = set()
+        loaded: Optional[List[str]] = None
+        for chunk in ImportService.iter_chunks(source, fmt, chunk_rows):
+            report["read"] += len(chunk)
+            chunk = chunk.rename(columns=_column_name)
+            if date_format is None and "date" in chunk:
+                # One format for the whole file, so a date never reads differently from its neighbours.
+                date_format = ImportService.infer_date_format(chunk["date"])
+            clean = ImportService.normalize(chunk, report["errors"], date_format or "ISO8601")
+            report["invalid"] += len(chunk) - len(clean)
+            if not clean.empty:
+                # Only read ledger days this chunk reaches beyond the range already loaded.
+                first, last = clean["date"].min(), clean["date"].max()
+                if loaded is None:
+                    seen |= ImportService._existing_hashes(first, last)
+                    loaded = [first, last]
+                if first < loaded[0]:
+                    seen |= ImportService._existing_hashes(first, loaded[0])
+                    loaded[0] = first
+                if last > loaded[1]:
+                    seen |= ImportService._existing_hashes(loaded[1], last)
+                    loaded[1] = last
+                hashes = _row_hashes(clean)
+                known = np.fromiter((value in seen for value in hashes.tolist()), dtype=bool, count=len(hashes))
+                dup = pd.Series(hashes).duplicated().to_numpy() | known
+                report["duplicates"] += int(dup.sum())
+                fresh = clean[~dup]
+                seen.update(hashes[~dup].tolist())
+                report["inserted"] += ExpenseService.bulk_insert(fresh) if not fresh.empty else 0
+
+            if progress is not None:
+                if total_rows:
+                    fraction = report["read"] / total_rows
+                else:
+                    fraction = source.tell() / total_bytes if total_bytes else 0.0
+                progress(min(fraction, 1.0), f"{report['read']:,} rows read, {report['inserted']:,} imported")
+
+        report["seconds"] = time.perf_counter() - start
+        report["rows_per_sec"] = report["read"] / report["seconds"] if report["seconds"] else 0.0
+        if progress is not None:
+            progress(1.0, f"Done: {report['inserted']:,} of {report['read']:,} rows imported")
+        return report
@@ -0,0 +1,218 @@
+import os
+import re
+import threading
+from datetime import date, datetime
+from itertools import islice, takewhile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from dateutil.rrule import rrulestr
+
+from db.database import bump_data_version, database_at, execute, fetch_tuples, transaction
+from profiling import PROFILER
+from services.forecast_service import ForecastService
+
+# Seconds between background runs (EXPENSE_RECURRING_INTERVAL); 0 posts only when a session starts.
+RECURRING_INTERVAL = float(os.environ.get("EXPENSE_RECURRING_INTERVAL", "0"))
+# Occurrences one rule may post per run; a longer backlog carries on in the next run.
+CATCHUP_LIMIT = 10_000
+# Schedules offered by the Recurring page; "Custom" takes an RRULE as typed.
+SCHEDULES = ["Monthly", "Weekly", "Yearly", "Daily", "Custom"]
+RULE_COLUMNS = [
+    "id",
+    "name",
+    "rrule",
+    "start_date",
+    "end_date",
+    "amount",
+    "category",
+    "payment_method",
+    "notes",
+    "posted_through",
+    "next_due",
+]
+# Frequencies finer than DAILY, as spelled in an RRULE's FREQ= part.
+SUB_DAILY_FREQUENCIES = {"HOURLY", "MINUTELY", "SECONDLY"}
+FREQ_PATTERN = re.compile(r"\bFREQ=(\w+)", re.IGNORECASE)
+# The unique (rule_id, date) index makes re-posting an occurrence a no-op.
+INSERT_OCCURRENCE = (
+    "INSERT INTO expenses(date, amount, category, payment_method, notes, rule_id) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING"
+)
+
+
+def _schedule(rule: str, start: str):
+    try:
+        return rrulestr(rule, dtstart=datetime.fromisoformat(start))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid recurrence rule {rule!r}: {exc}") from exc
+
+
+def _check_daily_or_coarser(schedule, rule: str) -> None:
+    # Expenses are dated, not timed: a rule firing twice on one day could never get past that day.
+    frequencies = {freq.upper() for freq in FREQ_PATTERN.findall(rule)}
+    first_two = [moment.date() for moment in islice(schedule, 2)]
+    if frequencies & SUB_DAILY_FREQUENCIES or (len(first_two) == 2 and first_two[0] == first_two[1]):
+        raise ValueError(f"Recurrence rule {rule!r} repeats more than once a day; use DAILY or coarser.")
+
+
+def _next_due(schedule, after: Optional[str], end: Optional[str]) -> Optional[str]:
+    upcoming = schedule.after(datetime.fromisoformat(after)) if after else next(iter(schedule), None)
+    if upcoming is None or (end and upcoming.date().isoformat() > end):
+        return None
+    return upcoming.date().isoformat()
+
+
+def _due(rule: Dict[str, Any], today: date) -> Tuple[List[str], Optional[str]]:
+    """Occurrence dates after posted_through up to today (capped), and the one after the last of them."""
+    schedule = _schedule(rule["rrule"], rule["start_date"])
+    stop = min(today.isoformat(), rule["end_date"] or today.isoformat())
+    after = rule["posted_through"]
+    stream = schedule.xafter(datetime.fromisoformat(after)) if after else iter(schedule)
+    days = (moment.date().isoformat() for moment in stream)
+    due = list(islice(takewhile(lambda day: day <= stop, days), CATCHUP_LIMIT))
+    return due, _next_due(schedule, due[-1] if due else after, rule["end_date"])
+
+
+class RecurringService:
+    """Recurring-expense rules and the idempotent catch-up run that posts their due occurrences.
+
+    Each rule remembers the last date it posted (``posted_through``) and its next occurrence
+    (``next_due``), so a run only expands schedules that are due and never posts a date twice.
+    """
+
+    @staticmethod
+    def schedule_rule(schedule: str, start: date, custom: str = "") -> str:
+        """RRULE for one of SCHEDULES, anchored on the start date."""
+        if schedule == "Monthly":
+            if start.day <= 28:
+                return f"FREQ=MONTHLY;BYMONTHDAY={start.day}"
+            # The 29th-31st fall back to the last day of shorter months.
+            return f"FREQ=MONTHLY;BYMONTHDAY={','.join(str(day) for day in range(28, start.day + 1))};BYSETPOS=-1"
+        if schedule == "Weekly":
+            return "FREQ=WEEKLY"
+        if schedule == "Yearly":
+            return "FREQ=YEARLY;BYMONTH=2;BYMONTHDAY=28,29;BYSETPOS=-1" if (start.month, start.day) == (2, 29) else "FREQ=YEARLY"
+        if schedule == "Daily":
+            return "FREQ=DAILY"
+        if schedule == "Custom":
+            return custom.strip()
+        raise ValueError(f"Unknown schedule: {schedule}")
+
+    @staticmethod
+    def occurrences(
+        rule: str, start: str, end: Optional[str] = None, after: Optional[str] = None, count: int = 5
+    ) -> List[str]:
+        """The first ``count`` dates of a schedule, from ``after`` (inclusive) if given, for previews."""
+        schedule = _schedule(rule, start)
+        stream = schedule.xafter(datetime.fromisoformat(after), inc=True) if after else iter(schedule)
+        days = (moment.date().isoformat() for moment in stream)
+        return [day for day in islice(days, count) if not end or day <= end]
+
+    @staticmethod
+    def add_rule(data: Dict[str, Any]) -> int:
+        """Validate and store a rule; its past occurrences are posted by the next post_due run."""
+        if data.get("end_date") and data["end_date"] < data["start_date"]:
+            raise ValueError("End date is before the start date.")
+        schedule = _schedule(data["rrule"], data["start_date"])
+        _check_daily_or_coarser(schedule, data["rrule"])
+        next_due = _next_due(schedule, None, data.get("end_date"))
+        if next_due is None:
+            raise ValueError("The schedule has no occurrences.")
+        return execute(
+            "INSERT INTO recurring_rules(name, rrule, start_date, end_date, amount, category, payment_method, notes, next_due) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                data["name"],
+                data["rrule"],
+                data["start_date"],
+                data.get("end_date"),
+                float(data["amount"]),
+                data["category"],
+                data["payment_method"],
+                data.get("notes", ""),
+                next_due,
+            ),
+        )
+
+    @staticmethod
+    def delete_rule(rule_id: int) -> None:
+        # Expenses it already posted stay in the ledger; their rule_id is cleared.
+        execute("DELETE FROM recurring_rules WHERE id=?", (rule_id,))
+
+    @staticmethod
+    def list_rules() -> pd.DataFrame:
+        rows = fetch_tuples(f"SELECT {', '.join(RULE_COLUMNS)} FROM recurring_rules ORDER BY next_due IS NULL, next_due, name")
+        return pd.DataFrame(rows, columns=RULE_COLUMNS)
+
+    @staticmethod
+    def post_due(today: Optional[date] = None) -> int:
+        """Post every occurrence due by ``today`` in one transaction; returns the expenses inserted."""
+        today = today or date.today()
+        cutoff = today.isoformat()
+        # Indexed check first, so the usual run with nothing due never takes the write lock.
+        if not fetch_tuples("SELECT 1 FROM recurring_rules WHERE next_due <= ? LIMIT 1", (cutoff,)):
+            return 0
+        with PROFILER.span("write", "RecurringService.post_due") as span, transaction() as conn:
+            # Read again under the write lock: a concurrent run may have posted these already.
+            rules = conn.execute(
+                f"SELECT {', '.join(RULE_COLUMNS)} FROM recurring_rules WHERE next_due <= ?", (cutoff,)
+            ).fetchall()
+            rows, marks = [], []
+            for rule in rules:
+                due, next_due = _due(rule, today)
+                notes = rule["notes"] or rule["name"]
+                rows.extend(
+                    (day, rule["amount"], rule["category"], rule["payment_method"], notes, rule["id"]) for day in due
+                )
+                marks.append((due[-1] if due else rule["posted_through"], next_due, rule["id"]))
+            # Date order keeps the forecast statistics incremental instead of marking them stale.
+            rows.sort(key=lambda row: row[0])
+            inserted = conn.executemany(INSERT_OCCURRENCE, rows).rowcount if rows else 0
+            conn.executemany("UPDATE recurring_rules SET posted_through=?, next_due=? WHERE id=?", marks)
+            span["rows"] = inserted
+        if inserted:
+            bump_data_version()
+            # A backfill can land before expenses already in the ledger, marking statistics stale.
+            ForecastService.rebuild()
+        return inserted
+
+
+class RecurringScheduler:
+    """Daemon thread that runs post_due every ``interval`` seconds for each watched database."""
+
+    def __init__(self, interval: float = RECURRING_INTERVAL) -> None:
+        self.interval = interval
+        self._paths: Set[Path] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, path: Path) -> None:
+        with self._lock:
+            self._paths.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="recurring-scheduler", daemon=True)
+                self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                paths = list(self._paths)
+            for path in paths:
+                with database_at(path):
+                    try:
+                        RecurringService.post_due()
+                    except Exception:
+                        # One broken ledger must not stop the others; sessions still post on start.
+                        continue
+
+
+# Shared by every session in the process; only started when RECURRING_INTERVAL is set.
+RECURRING_SCHEDULER = RecurringScheduler()
@@ -0,0 +1,133 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from profiling import PROFILER
+
+FREQUENCIES = ("Daily", "Weekly", "Monthly")
+# Every frequency period_ordinals understands, finest first; the last two only for long ranges.
+GRANULARITIES = FREQUENCIES + ("Quarterly", "Yearly")
+# Months per period for the frequencies built on calendar months.
+_MONTHS_PER_PERIOD = {"Monthly": 1, "Quarterly": 3, "Yearly": 12}
+# Day key 0 (1970-01-01) was a Thursday; shifting by 3 makes weeks start on Monday.
+_WEEK_SHIFT = 3
+
+
+def _factorize(frame: pd.DataFrame, by: Sequence[str]) -> Tuple[np.ndarray, List[pd.Index], Tuple[int, ...]]:
+    """Encode the group columns as one mixed-radix integer code per row."""
+    codes = np.zeros(len(frame), dtype=np.int64)
+    labels: List[pd.Index] = []
+    for column in by:
+        col_codes, uniques = pd.factorize(frame[column], sort=True)
+        codes = codes * len(uniques) + col_codes
+        labels.append(pd.Index(uniques))
+    return codes, labels, tuple(len(values) for values in labels)
+
+
+class ResampleService:
+    """Daily to Yearly bucketing on integer day keys (days since 1970-01-01)."""
+
+    @staticmethod
+    def day_keys(dates: pd.Series) -> np.ndarray:
+        return dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+    @staticmethod
+    def period_ordinals(day_keys: np.ndarray, freq: str) -> np.ndarray:
+        days = np.asarray(day_keys, dtype=np.int64)
+        if freq == "Daily":
+            return days
+        if freq == "Weekly":
+            return (days + _WEEK_SHIFT) // 7
+        if freq in _MONTHS_PER_PERIOD:
+            months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            return months // _MONTHS_PER_PERIOD[freq]
+        raise ValueError(f"Unknown frequency: {freq}")
+
+    @staticmethod
+    def period_starts(ordinals: np.ndarray, freq: str) -> np.ndarray:
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        if freq == "Daily":
+            return ordinals.astype("datetime64[D]")
+        if freq == "Weekly":
+            return (ordinals * 7 - _WEEK_SHIFT).astype("datetime64[D]")
+        if freq in _MONTHS_PER_PERIOD:
+            return (ordinals * _MONTHS_PER_PERIOD[freq]).astype("datetime64[M]").astype("datetime64[D]")
+        raise ValueError(f"Unknown frequency: {freq}")
+
+    @staticmethod
+    def month_ordinal(month: str) -> int:
+        """Ordinal of a YYYY-MM string on the Monthly scale used by period_ordinals."""
+        return int(np.datetime64(month, "M").astype(np.int64))
+
+    @staticmethod
+    def auto_frequency(day_keys: np.ndarray, max_points: int, freqs: Sequence[str] = GRANULARITIES) -> str:
+        """Finest of ``freqs`` that spans the day keys' range in at most ``max_points`` periods."""
+        days = np.asarray(day_keys, dtype=np.int64)
+        if not days.size:
+            return freqs[0]
+        bounds = np.array([days.min(), days.max()])
+        for freq in freqs:
+            first, last = ResampleService.period_ordinals(bounds, freq)
+            if last - first + 1 <= max_points:
+                return freq
+        return freqs[-1]
+
+    @staticmethod
+    @PROFILER.timed("pandas")
+    def resample_all(
+        frame: pd.DataFrame,
+        by: Sequence[str] = (),
+        freqs: Sequence[str] = FREQUENCIES,
+        dense: bool = False,
+    ) -> Dict[str, pd.DataFrame]:
+        """Sum amount (and count) per period and group for several frequencies at once.
+
+        ``frame`` needs ``amount`` and ``day_key`` (or datetime ``date``) columns, the ``by``
+        columns and optionally ``count`` (each row counts once otherwise). With ``dense`` every
+        period between the first and last is emitted, zero-filled, like ``DataFrame.resample``.
+        """
+        by = list(by)
+        columns = ["date", *by, "amount", "count"]
+        if frame.empty:
+            return {freq: pd.DataFrame(columns=columns) for freq in freqs}
+
+        if "day_key" in frame:
+            days = frame["day_key"].to_numpy(dtype=np.int64)
+        else:
+            days = ResampleService.day_keys(frame["date"])
+        amounts = frame["amount"].to_numpy(dtype=np.float64)
+        counts = frame["count"].to_numpy(dtype=np.float64) if "count" in frame else None
+        codes, labels, shape = _factorize(frame, by)
+        n_groups = int(np.prod(shape)) if by else 1
+
+        # The only pass over the input builds a dense (day, group) grid; coarser periods are
+        # contiguous runs of days, so they are summed from the grid with reduceat.
+        first = int(days.min())
+        n_days = int(days.max()) - first + 1
+        slots = (days - first) * n_groups + codes
+        daily_sums = np.bincount(slots, weights=amounts, minlength=n_days * n_groups).reshape(n_days, n_groups)
+        daily_tallies = np.bincount(slots, weights=counts, minlength=n_days * n_groups).reshape(n_days, n_groups)
+        span = np.arange(first, first + n_days)
+
+        out: Dict[str, pd.DataFrame] = {}
+        for freq in freqs:
+            ordinals = ResampleService.period_ordinals(span, freq)
+            runs = np.flatnonzero(np.r_[True, ordinals[1:] != ordinals[:-1]])
+            sums = np.add.reduceat(daily_sums, runs, axis=0).ravel()
+            tallies = np.add.reduceat(daily_tallies, runs, axis=0).ravel()
+            keep = np.arange(sums.size) if dense else np.flatnonzero(tallies)
+
+            periods = ordinals[runs][keep // n_groups]
+            result = {"date": ResampleService.period_starts(periods, freq).astype("datetime64[ns]")}
+            if by:
+                for column, values, index in zip(by, labels, np.unravel_index(keep % n_groups, shape)):
+                    result[column] = pd.Categorical.from_codes(index, values)
+            result["amount"] = sums[keep]
+            result["count"] = tallies[keep].astype(np.int64)
+            out[freq] = pd.DataFrame(result, columns=columns)
+        return out
+
+    @staticmethod
+    def resample(frame: pd.DataFrame, freq: str, by: Sequence[str] = (), dense: bool = False) -> pd.DataFrame:
+        return ResampleService.resample_all(frame, by, (freq,), dense)[freq]
@@ -0,0 +1,29 @@
+import sqlite3
+
+import pytest
+
+import db.database as database
+from benchmarks.common import temp_database
+
+
+@pytest.fixture
+def ledger():
+    """A migrated, empty shared database in a temporary directory."""
+    with temp_database() as path:
+        yield path
+
+
+@pytest.fixture
+def legacy_ledger(monkeypatch):
+    """Like ``ledger``, on connections held to the 999-parameter limit of SQLite before 3.32."""
+    open_connection = database.open_connection
+
+    def limited(path=None):
+        conn = open_connection(path)
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return conn
+
+    monkeypatch.setattr(database, "MAX_VARIABLES", 999)
+    monkeypatch.setattr(database, "open_connection", limited)
+    with temp_database() as path:
+        yield path
@@ -0,0 +1,33 @@
+from db.database import init_db, tenant_database
+from services import analytics_service
+from services.analytics_service import PLOT_CACHE, AnalyticsService
+from services.expense_service import ExpenseService
+
+
+def test_export_png_writes_to_disk_only_on_a_cache_miss(ledger, tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_service, "PLOTS_DIR", tmp_path)
+    ExpenseService.bulk_insert(ExpenseService.generate_expenses(200, start_date="2024-01-01", end_date="2024-06-30"))
+    frame = ExpenseService.buckets(by=["category"])["Daily"]
+    PLOT_CACHE.clear()
+
+    png = AnalyticsService.export_png("daily_trend", frame)
+    saved = tmp_path / "daily_trend.png"
+    assert saved.read_bytes() == png
+    saved.unlink()
+
+    assert AnalyticsService.export_png("daily_trend", frame) == png
+    assert not saved.exists()
+
+
+def test_tenant_exports_are_saved_under_the_ledger(ledger, tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics_service, "PLOTS_DIR", tmp_path)
+    expenses = ExpenseService.generate_expenses(200, start_date="2024-01-01", end_date="2024-06-30")
+    ExpenseService.bulk_insert(expenses)
+    PLOT_CACHE.clear()
+    shared = AnalyticsService.export_png("daily_trend", ExpenseService.buckets(by=["category"])["Daily"])
+    with tenant_database("alice"):
+        init_db()
+        ExpenseService.bulk_insert(expenses)
+        alice = AnalyticsService.export_png("daily_trend", ExpenseService.buckets(by=["category"])["Daily"])
+    assert (tmp_path / "daily_trend.png").read_bytes() == shared
+    assert (tmp_path / "alice" / "daily_trend.png").read_bytes() == alice
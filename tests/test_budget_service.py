@@ -0,0 +1,15 @@
+import pytest
+
+from services.budget_service import BudgetService
+from services.expense_service import ExpenseService
+
+
+def test_month_spent_reads_unpadded_months(ledger):
+    ExpenseService.add_expense({"date": "2025-01-15", "amount": 250.0, "category": "Food", "payment_method": "UPI"})
+    assert BudgetService.month_spent("2025-01") == BudgetService.month_spent("2025-1") == 250.0
+
+
+@pytest.mark.parametrize("month", ["2025", "2025-1-x", "2025-13"])
+def test_month_spent_rejects_malformed_months(ledger, month):
+    with pytest.raises(ValueError, match="YYYY-MM"):
+        BudgetService.month_spent(month)
@@ -0,0 +1,13 @@
+from db.database import fetch_tuples
+from services.expense_service import EDIT_BATCH_ROWS, ExpenseService
+
+
+def test_save_edits_stays_within_the_legacy_parameter_limit(legacy_ledger):
+    ExpenseService.bulk_insert(ExpenseService.generate_expenses(EDIT_BATCH_ROWS + 1, start_date="2025-01-01"))
+    original = ExpenseService.list_expenses(with_version=True)
+    edited = original.copy()
+    edited["amount"] = edited["amount"] + 1
+    edited["notes"] = "edited"
+    saved, conflicts = ExpenseService.save_edits(ExpenseService.diff_edits(original, edited))
+    assert (len(saved), conflicts) == (EDIT_BATCH_ROWS + 1, [])
+    assert fetch_tuples("SELECT COUNT(*) FROM expenses WHERE notes = 'edited' AND version = 1") == [(EDIT_BATCH_ROWS + 1,)]
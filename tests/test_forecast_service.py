@@ -0,0 +1,71 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from db.database import execute, fetch_tuples
+from services.expense_service import ExpenseService
+from services.forecast_service import ForecastService
+
+STATS_QUERIES = (
+    "SELECT category, first_month, txn_sum, txn_sq, txn_weight FROM category_stats ORDER BY category",
+    "SELECT category, dom, open_month, open_total, month_sum, month_sq, month_weight FROM day_of_month_stats "
+    "ORDER BY category, dom",
+)
+
+
+def _snapshot() -> list:
+    return [fetch_tuples(query) for query in STATS_QUERIES]
+
+
+def _stale() -> int:
+    return fetch_tuples("SELECT COUNT(*) FROM category_stats WHERE stale = 1")[0][0]
+
+
+@pytest.fixture
+def forecast_ledger(ledger):
+    ExpenseService.bulk_insert(ExpenseService.generate_expenses(5_000, start_date="2022-01-01").sort_values("date"))
+    return ledger
+
+
+def test_in_order_inserts_leave_no_category_stale(forecast_ledger):
+    ExpenseService.add_expense(
+        {"date": date.today().isoformat(), "amount": 99.5, "category": "Food", "payment_method": "UPI", "notes": ""}
+    )
+    assert _stale() == 0
+
+
+def test_incremental_statistics_match_a_rebuild_after_edits(forecast_ledger):
+    sample = ExpenseService.list_expenses().sample(600, random_state=1)
+    ExpenseService.delete_expenses(sample["id"].iloc[:300].tolist())
+    moved = sample.iloc[300:].assign(date="2023-03-15", amount=lambda f: f["amount"] * 2, category="Other")
+    ExpenseService.update_expenses(moved.to_dict("records"))
+    ExpenseService.add_expense(
+        {"date": "2022-06-01", "amount": 10.0, "category": "Health", "payment_method": "Cash", "notes": "back-dated"}
+    )
+    assert _stale() == 0  # each write rebuilt what it marked stale
+    incremental = _snapshot()
+    ForecastService.rebuild([row[0] for row in fetch_tuples("SELECT category FROM category_stats")])
+    for ours, rebuilt in zip(incremental, _snapshot()):
+        assert [row[:2] for row in ours] == [row[:2] for row in rebuilt]
+        np.testing.assert_allclose(
+            np.array([row[2:] for row in ours], dtype=float),
+            np.array([row[2:] for row in rebuilt], dtype=float),
+            rtol=1e-9,
+            atol=1e-6,
+        )
+
+
+def test_reads_use_the_last_statistics_instead_of_rebuilding(forecast_ledger):
+    execute("UPDATE expenses SET amount = amount * 2 WHERE category = 'Food'")  # bypasses the service
+    before = _snapshot()
+    ForecastService.month_forecast(date.today().strftime("%Y-%m"))
+    ForecastService.score("Food", 500.0)
+    ForecastService.anomalies(ExpenseService.list_expenses(limit=100))
+    assert (_stale(), _snapshot()) == (1, before)
+
+
+@pytest.mark.parametrize("month", ["2025", "2025-1-x", "2025-13", "June"])
+def test_malformed_month_is_rejected_clearly(ledger, month):
+    with pytest.raises(ValueError, match="YYYY-MM"):
+        ForecastService.month_forecast(month)
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from db.database import fetch_tuples
+from services.expense_service import INSERT_BATCH_ROWS, ExpenseService
+from services.import_service import DATE_FORMATS, ImportService
+
+
+def _csv(*rows: str) -> io.BytesIO:
+    handle = io.BytesIO(("date,amount,category,payment_method,notes\n" + "\n".join(rows) + "\n").encode())
+    handle.name = "statement.csv"
+    return handle
+
+
+def test_day_first_file_is_read_day_first_throughout(ledger):
+    report = ImportService.import_file(_csv("05/01/2025,100,Food,Cash,a", "13/01/2025,200,Food,Cash,b"))
+    assert report["inserted"] == 2
+    assert fetch_tuples("SELECT date FROM expenses ORDER BY date") == [("2025-01-05",), ("2025-01-13",)]
+
+
+def test_ambiguous_dates_need_an_explicit_format(ledger):
+    statement = ("05/01/2025,100,Food,Cash,a", "06/02/2025,200,Food,Cash,b")
+    with pytest.raises(ValueError, match="day-first or month-first"):
+        ImportService.import_file(_csv(*statement))
+    report = ImportService.import_file(_csv(*statement), date_format=DATE_FORMATS["DD/MM/YYYY"])
+    assert report["inserted"] == 2
+    assert fetch_tuples("SELECT date FROM expenses ORDER BY date") == [("2025-01-05",), ("2025-02-06",)]
+
+
+def test_dates_in_another_format_are_invalid_rows(ledger):
+    report = ImportService.import_file(
+        _csv("2025-01-05,100,Food,Cash,a", "2025-01-06,100,Food,Cash,b", "13/01/2025,200,Food,Cash,c")
+    )
+    assert (report["inserted"], report["invalid"], report["errors"]) == (2, 1, {"invalid date": 1})
+
+
+def test_reimport_skips_existing_and_repeated_rows(ledger):
+    rows = ("2025-01-05,100,Food,Cash,a", "2025-01-05,100,Food,Cash,a", "2025-01-06,50,Food,Cash,b")
+    first = ImportService.import_file(_csv(*rows), chunk_rows=2)
+    again = ImportService.import_file(_csv(*rows), chunk_rows=2)
+    assert (first["inserted"], first["duplicates"]) == (2, 1)
+    assert (again["inserted"], again["duplicates"]) == (0, 3)
+
+
+def test_import_spanning_several_insert_batches_is_searchable(ledger):
+    rows = [f"2025-01-{day % 28 + 1:02d},{day + 1},Food,Cash,row {day}" for day in range(INSERT_BATCH_ROWS * 2 + 1)]
+    report = ImportService.import_file(_csv(*rows))
+    assert report["inserted"] == len(rows)
+    assert fetch_tuples("SELECT COUNT(*), SUM(amount) FROM expenses") == [(len(rows), sum(range(1, len(rows) + 1)))]
+    assert len(ExpenseService.search_expense_ids("row")) == len(rows)
+
+
+def test_duplicates_are_found_as_later_chunks_widen_the_date_range(ledger, monkeypatch):
+    ImportService.import_file(_csv("2024-06-01,1,Food,Cash,old", "2025-01-01,2,Food,Cash,a", "2025-03-01,3,Food,Cash,c"))
+    ranges = []
+    lookup = ImportService._existing_hashes
+    monkeypatch.setattr(ImportService, "_existing_hashes", lambda first, last: ranges.append((first, last)) or lookup(first, last))
+    rows = ("2025-02-01,9,Food,Cash,b", "2025-01-01,2,Food,Cash,a", "2025-03-01,3,Food,Cash,c", "2025-03-01,4,Food,Cash,d")
+    report = ImportService.import_file(_csv(*rows), chunk_rows=1)
+    assert (report["inserted"], report["duplicates"]) == (2, 2)
+    assert min(first for first, _ in ranges) == "2025-01-01"  # the 2024 row is never read
+
+
+def test_import_stays_within_the_legacy_parameter_limit(legacy_ledger):
+    rows = [f"2025-01-{day % 28 + 1:02d},{day + 1},Food,Cash,row {day}" for day in range(INSERT_BATCH_ROWS + 1)]
+    assert ImportService.import_file(_csv(*rows))["inserted"] == len(rows)
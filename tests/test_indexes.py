@@ -0,0 +1,80 @@
+from typing import List, Tuple
+
+import pytest
+
+from benchmarks.common import temp_database
+from db.database import execute, explain_query_plan
+from services.expense_service import ExpenseService
+
+# (label, query, params, index the plan must mention)
+EXPECTED_PLANS: List[Tuple[str, str, Tuple, str]] = [
+    (
+        "date range",
+        "SELECT * FROM expenses WHERE date BETWEEN ? AND ?",
+        ("2024-01-01", "2024-01-31"),
+        "idx_expenses_date",
+    ),
+    (
+        "category in range",
+        "SELECT SUM(amount) FROM expenses WHERE category = ? AND date BETWEEN ? AND ?",
+        ("Food", "2024-01-01", "2024-03-31"),
+        "idx_expenses_category_date",
+    ),
+    (
+        "payment method in range",
+        "SELECT SUM(amount) FROM expenses WHERE payment_method = ? AND date >= ?",
+        ("UPI", "2024-06-01"),
+        "idx_expenses_method_date",
+    ),
+    (
+        "day key range",
+        "SELECT SUM(amount) FROM expenses WHERE day_key BETWEEN ? AND ?",
+        (19723, 19753),
+        "idx_expenses_day_key",
+    ),
+    (
+        "single month",
+        "SELECT SUM(amount) FROM expenses WHERE month_key = ?",
+        (202401,),
+        "idx_expenses_month_key",
+    ),
+    (
+        "keyset page by date",
+        "SELECT id FROM expenses WHERE (date, id) < (?, ?) ORDER BY date DESC, id DESC LIMIT 50",
+        ("2024-06-01", 10_000),
+        "idx_expenses_date",
+    ),
+    (
+        "keyset page by amount",
+        "SELECT id FROM expenses WHERE (amount, id) > (?, ?) ORDER BY amount, id LIMIT 50",
+        (500.0, 10_000),
+        "idx_expenses_amount",
+    ),
+    (
+        "next category label",
+        "SELECT MIN(category) FROM expenses WHERE category > ?",
+        ("Food",),
+        "idx_expenses_category_date",
+    ),
+    (
+        "next payment method label",
+        "SELECT MIN(payment_method) FROM expenses WHERE payment_method > ?",
+        ("Card",),
+        "idx_expenses_method_date",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def analyzed_ledger():
+    """A ledger large enough, once ANALYZEd, for the planner to prefer indexes over scans."""
+    with temp_database() as path:
+        ExpenseService.bulk_insert(ExpenseService.generate_expenses(20_000, start_date="2019-01-01"))
+        execute("ANALYZE")
+        yield path
+
+
+@pytest.mark.parametrize("label, query, params, index", EXPECTED_PLANS, ids=[plan[0] for plan in EXPECTED_PLANS])
+def test_hot_query_uses_its_index(analyzed_ledger, label, query, params, index):
+    plan = explain_query_plan(query, params)
+    assert any(index in step for step in plan), " | ".join(plan)
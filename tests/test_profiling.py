@@ -0,0 +1,77 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import profiling
+from profiling import PROFILER, Profiler
+from services.analytics_service import PLOT_CACHE, AnalyticsService
+from services.expense_service import ExpenseService
+
+APP_PATH = str(Path(__file__).resolve().parent.parent / "app.py")
+
+
+def test_chart_span_counts_input_rows(ledger):
+    ExpenseService.bulk_insert(ExpenseService.generate_expenses(500, start_date="2024-01-01", end_date="2024-12-31"))
+    frame = ExpenseService.buckets(by=["category"])["Daily"]
+    PLOT_CACHE.clear()
+    with PROFILER.run("test") as run:
+        AnalyticsService.category_distribution(frame)
+        AnalyticsService.daily_trend(frame)
+    spans = {span["name"]: span["rows"] for span in run["spans"] if span["kind"] == "chart"}
+    assert spans == {
+        "AnalyticsService.category_distribution": len(frame),
+        "AnalyticsService.daily_trend": len(frame),
+    }
+
+
+def test_list_and_frame_results_count_rows():
+    @PROFILER.timed("query")
+    def rows():
+        return [(1,), (2,), (3,)]
+
+    @PROFILER.timed("pandas")
+    def frame():
+        return pd.DataFrame({"a": range(4)})
+
+    with PROFILER.run("test") as run:
+        rows()
+        frame()
+    assert [span["rows"] for span in run["spans"]] == [3, 4]
+
+
+def _as_session(monkeypatch, session_id: str) -> None:
+    monkeypatch.setattr(profiling, "_frontend_context", lambda: SimpleNamespace(session_id=session_id))
+
+
+def test_runs_are_kept_and_cleared_per_session(monkeypatch):
+    profiler = Profiler(max_sessions=2)
+    for session in ("a", "b", "a", "c"):
+        _as_session(monkeypatch, session)
+        with profiler.run(session):
+            pass
+    assert [run["page"] for run in profiler.runs("a")] == ["a", "a"]
+    assert profiler.runs("b") == []  # least recently profiled, dropped for "c"
+    profiler.clear("a")
+    assert [run["session"] for run in profiler.runs()] == ["c"]
+
+
+def test_a_session_that_opted_out_records_nothing(monkeypatch):
+    profiler = Profiler()
+    _as_session(monkeypatch, "a")
+    with profiler.run("off", enabled=False) as run:
+        pass
+    assert (run, profiler.runs()) == (None, [])
+
+
+def test_turning_profiling_off_only_affects_that_session(ledger):
+    alice, bob = AppTest.from_file(APP_PATH, default_timeout=120), AppTest.from_file(APP_PATH, default_timeout=120)
+    alice.run()
+    bob.run()
+    alice.sidebar.radio[0].set_value("Diagnostics").run()
+    alice.toggle[0].set_value(False).run()
+    PROFILER.clear()
+    alice.sidebar.radio[0].set_value("Budgets & Goals").run()
+    bob.sidebar.radio[0].set_value("Settings").run()
+    assert [run["page"] for run in PROFILER.runs()] == ["Settings"]
@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+
+from db.database import fetch_tuples
+from services.recurring_service import RecurringService
+
+
+def _rule(rrule: str, start: str = "2025-01-01") -> dict:
+    return {"name": "Rent", "rrule": rrule, "start_date": start, "amount": 100.0, "category": "Rent", "payment_method": "UPI"}
+
+
+@pytest.mark.parametrize(
+    "rrule",
+    [
+        "FREQ=HOURLY",
+        "FREQ=MINUTELY",
+        "FREQ=SECONDLY",
+        "freq=hourly;byhour=9",
+        "RRULE:FREQ=HOURLY;INTERVAL=24",
+        "FREQ=DAILY;BYHOUR=9,17",
+    ],
+)
+def test_sub_daily_rules_are_rejected(ledger, rrule):
+    with pytest.raises(ValueError, match="more than once a day"):
+        RecurringService.add_rule(_rule(rrule))
+    assert fetch_tuples("SELECT COUNT(*) FROM recurring_rules") == [(0,)]
+
+
+def test_post_due_is_idempotent(ledger):
+    RecurringService.add_rule(_rule(RecurringService.schedule_rule("Monthly", date(2025, 1, 31)), "2025-01-31"))
+    assert RecurringService.post_due(date(2025, 4, 30)) == 4
+    assert RecurringService.post_due(date(2025, 4, 30)) == 0
+    assert fetch_tuples("SELECT date FROM expenses ORDER BY date") == [
+        ("2025-01-31",),
+        ("2025-02-28",),
+        ("2025-03-31",),
+        ("2025-04-30",),
+    ]
@@ -0,0 +1,30 @@
+import pytest
+
+from db.database import fetch_tuples, verify_rollups
+from services.budget_service import BudgetService
+from services.expense_service import ExpenseService
+
+
+@pytest.fixture
+def edited_ledger(ledger):
+    """A ledger that has been through every expense write path."""
+    ExpenseService.bulk_insert(ExpenseService.generate_expenses(5_000, start_date="2022-01-01"))
+    sample = ExpenseService.list_expenses(with_version=True).sample(600, random_state=1)
+    ExpenseService.delete_expenses(sample["id"].iloc[:200].tolist())
+    moved = sample.iloc[200:400].assign(date="2023-03-15", amount=lambda f: f["amount"] * 2, category="Other")
+    ExpenseService.update_expenses(moved.to_dict("records"))
+    edited = sample.iloc[400:].assign(amount=lambda f: f["amount"] + 1, payment_method="Cash")
+    ExpenseService.save_edits(ExpenseService.diff_edits(sample.iloc[400:], edited))
+    ExpenseService.add_expense(
+        {"date": "2023-03-15", "amount": 99.5, "category": "Food", "payment_method": "UPI", "notes": "single"}
+    )
+    return ledger
+
+
+def test_rollup_matches_a_rebuild_from_raw_rows(edited_ledger):
+    assert verify_rollups() == []
+
+
+def test_month_spent_from_the_rollup_matches_the_raw_rows(edited_ledger):
+    raw = fetch_tuples("SELECT SUM(amount) FROM expenses WHERE date LIKE '2023-03-%'")[0][0]
+    assert BudgetService.month_spent("2023-03") == pytest.approx(raw)